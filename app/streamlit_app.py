@@ -10,6 +10,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import sys
 import io
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -72,8 +74,10 @@ st.markdown("Analyze ride efficiency, identify bottlenecks, and compare routing
 def load_data():
     """Load processed data files with proper datetime parsing."""
     try:
+        # The pyarrow engine parses the CSV (including timestamps) multithreaded
         trips = pd.read_csv(
             PROCESSED_DIR / "trips_with_efficiency.csv",
+            engine="pyarrow",
             parse_dates=[
                 "requested_pickup_time",
                 "scheduled_pickup_time",
@@ -81,6 +85,29 @@ def load_data():
                 "actual_dropoff_time",
             ],
         )
+        # Downcast the analysis columns; flags become plain bools (NaN -> False)
+        trips["scheduled_hour"] = trips["scheduled_hour"].astype("uint8")
+        for col in [
+            "efficiency_index", "distance_miles", "pickup_delay_minutes",
+            "score_on_time", "score_route", "score_capacity", "score_idle",
+        ]:
+            trips[col] = pd.to_numeric(trips[col], downcast="float")
+        for col in ["is_cancelled", "is_late_pickup"]:
+            trips[col] = trips[col].eq(True)
+        
+        # Time-ordered rows keep the hour and day group keys in contiguous runs
+        trips = trips.sort_values("scheduled_pickup_time", kind="mergesort").reset_index(drop=True)
+        
+        # Categorical filter columns let the filters compare integer codes
+        for col in ["region", "trip_type", "driver_id"]:
+            trips[col] = trips[col].astype("category")
+        
+        # Cancelled trips are excluded from every analysis view, so split them off once
+        trips_active = trips[~trips["is_cancelled"]].reset_index(drop=True)
+        
+        # Small per-(region, trip type, hour, day) rollup the charts aggregate from
+        rollup = build_rollup(trips_active)
+        
         drivers = pd.read_csv(PROCESSED_DIR / "drivers.csv")
         simulations = pd.read_csv(PROCESSED_DIR / "simulation_results.csv")
         
@@ -96,37 +123,42 @@ def load_data():
         except FileNotFoundError:
             pass
             
-        return trips, drivers, simulations, evaluation, sensitivity
+        return trips, trips_active, drivers, simulations, evaluation, sensitivity, rollup
     except FileNotFoundError as e:
         st.error(f"Data files not found. Please run the data pipeline first: {e}")
-        return None, None, None, None, None
+        return None, None, None, None, None, None, None
 
 
-def calculate_bottlenecks(df: pd.DataFrame) -> dict:
-    """Identify operational bottlenecks from trip data."""
-    active = df[~df["is_cancelled"]]
+@st.cache_data
+def calculate_bottlenecks(active: pd.DataFrame) -> dict:
+    """Identify operational bottlenecks from active (non-cancelled) trip data."""
+    # Only scan the columns the aggregations below need
+    active = active[[
+        "driver_id", "scheduled_hour", "region",
+        "trip_id", "efficiency_index", "is_late_pickup",
+    ]]
     
     # Worst performing drivers
-    driver_perf = active.groupby("driver_id").agg({
-        "efficiency_index": "mean",
-        "is_late_pickup": "mean",
-        "trip_id": "count",
-    }).reset_index()
+    driver_perf = active.groupby("driver_id", observed=True, sort=False, as_index=False).agg(
+        efficiency_index=("efficiency_index", "mean"),
+        is_late_pickup=("is_late_pickup", "mean"),
+        trip_id=("trip_id", "size"),
+    )
     
     worst_drivers = driver_perf.nsmallest(5, "efficiency_index")
     
     # Worst hours
-    hourly_perf = active.groupby("scheduled_hour").agg({
-        "is_late_pickup": "mean",
-        "trip_id": "count",
-    }).reset_index()
+    hourly_perf = active.groupby("scheduled_hour", observed=True, sort=False, as_index=False).agg(
+        is_late_pickup=("is_late_pickup", "mean"),
+        trip_id=("trip_id", "size"),
+    )
     worst_hours = hourly_perf.nlargest(3, "is_late_pickup")
     
     # Worst regions
-    region_perf = active.groupby("region").agg({
-        "efficiency_index": "mean",
-        "is_late_pickup": "mean",
-    }).reset_index()
+    region_perf = active.groupby("region", observed=True, sort=False, as_index=False).agg(
+        efficiency_index=("efficiency_index", "mean"),
+        is_late_pickup=("is_late_pickup", "mean"),
+    )
     worst_regions = region_perf.nsmallest(3, "efficiency_index")
     
     return {
@@ -136,11 +168,11 @@ def calculate_bottlenecks(df: pd.DataFrame) -> dict:
     }
 
 
-def calculate_improvement_potential(df: pd.DataFrame) -> dict:
-    """Estimate potential improvements from optimization."""
-    active = df[~df["is_cancelled"]]
-    
-    current_on_time = 1 - active["is_late_pickup"].mean()
+@st.cache_data
+def calculate_improvement_potential(active: pd.DataFrame) -> dict:
+    """Estimate potential improvements from active (non-cancelled) trips."""
+    late = active["is_late_pickup"].to_numpy()
+    current_on_time = 1 - np.count_nonzero(late) / late.size if late.size else np.nan
     current_efficiency = active["efficiency_index"].mean()
     median_efficiency = active["efficiency_index"].median()
     
@@ -149,8 +181,10 @@ def calculate_improvement_potential(df: pd.DataFrame) -> dict:
     
     # Estimate cost savings (simplified)
     cost_per_mile = 2.15  # Industry average
-    avg_deviation = (active["trip_duration_minutes"] / 
-                     (active["distance_miles"].clip(lower=0.1) / 25 * 60)).mean()
+    # Actual vs expected (25 mph) duration in one pass over the raw arrays
+    distance = np.maximum(active["distance_miles"].to_numpy(), 0.1)
+    duration = active["trip_duration_minutes"].to_numpy()
+    avg_deviation = float(np.nanmean(duration / distance)) * (25 / 60)
     
     if avg_deviation > 1.2:
         miles_saving = active["distance_miles"].sum() * (avg_deviation - 1.2) / avg_deviation
@@ -169,8 +203,209 @@ def calculate_improvement_potential(df: pd.DataFrame) -> dict:
     }
 
 
+def build_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Pre-aggregate trips to one row per region, trip type, hour and day."""
+    scheduled_date = df["scheduled_pickup_time"].dt.normalize().rename("scheduled_date")
+    return df.groupby(
+        ["region", "trip_type", "scheduled_hour", scheduled_date],
+        observed=True,
+        sort=False,
+    ).agg(
+        trips=("trip_id", "size"),
+        late_trips=("is_late_pickup", "sum"),
+        scored_trips=("efficiency_index", "count"),
+        efficiency_sum=("efficiency_index", "sum"),
+        miles=("distance_miles", "sum"),
+    ).reset_index()
+
+
+def summarize_rollup(rollup: pd.DataFrame, by) -> pd.DataFrame:
+    """Collapse rollup rows into trip counts and weighted means per key."""
+    summary = rollup.groupby(by, observed=True)[[
+        "trips", "late_trips", "scored_trips", "efficiency_sum", "miles"
+    ]].sum().reset_index()
+    
+    summary["late_pickup_rate"] = summary["late_trips"] / summary["trips"]
+    summary["on_time_rate"] = (1 - summary["late_pickup_rate"]) * 100
+    summary["avg_efficiency"] = summary["efficiency_sum"] / summary["scored_trips"]
+    summary["avg_distance"] = summary["miles"] / summary["trips"]
+    return summary
+
+
+def region_hour_grid(rollup: pd.DataFrame) -> pd.DataFrame:
+    """Average efficiency on a region x hour grid, accumulated with bincount."""
+    regions = rollup["region"].cat.categories
+    cells = (
+        rollup["region"].cat.codes.to_numpy().astype(np.intp) * 24 +
+        rollup["scheduled_hour"].to_numpy().astype(np.intp)
+    )
+    n_cells = len(regions) * 24
+    efficiency_sums = np.bincount(cells, weights=rollup["efficiency_sum"].to_numpy(), minlength=n_cells)
+    scored_trips = np.bincount(cells, weights=rollup["scored_trips"].to_numpy(), minlength=n_cells)
+    grid = np.divide(
+        efficiency_sums, scored_trips,
+        out=np.full(n_cells, np.nan), where=scored_trips > 0,
+    ).reshape(len(regions), 24)
+    
+    # Keep only the regions and hours that have trips, as a pivot would
+    has_trips = scored_trips.reshape(len(regions), 24) > 0
+    rows, cols = has_trips.any(axis=1), has_trips.any(axis=0)
+    return pd.DataFrame(
+        grid[np.ix_(rows, cols)],
+        index=pd.Index(regions[rows], name="region"),
+        columns=pd.Index(np.arange(24)[cols], name="scheduled_hour"),
+    )
+
+
+def histogram_trace(values: np.ndarray, bins, **bar_kwargs) -> go.Bar:
+    """Bin values with numpy so only the bin counts are sent to the browser."""
+    counts, edges = np.histogram(values, bins=bins)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        **bar_kwargs,
+    )
+
+
+# Chart builders are cached on the small aggregated frames they plot, so
+# reruns triggered by unrelated widgets reuse the finished figures.
+@st.cache_data
+def build_hourly_chart(hourly: pd.DataFrame) -> go.Figure:
+    """Bar chart of on-time rate by hour of day."""
+    fig = px.bar(
+        hourly,
+        x="Hour",
+        y="On-Time Rate",
+        title="On-Time Rate by Hour of Day",
+        color="On-Time Rate",
+        color_continuous_scale="RdYlGn"
+    )
+    fig.update_layout(yaxis_title="On-Time Rate (%)")
+    return fig
+
+
+@st.cache_data
+def build_trip_type_chart(trip_type_perf: pd.DataFrame) -> go.Figure:
+    """Grouped bars of efficiency and on-time rate per trip type."""
+    return px.bar(
+        trip_type_perf,
+        x="Trip Type",
+        y=["Avg Efficiency", "On-Time Rate"],
+        barmode="group",
+        title="Efficiency & On-Time Rate by Trip Type"
+    )
+
+
+@st.cache_data
+def build_daily_trend_chart(daily_trends: pd.DataFrame) -> go.Figure:
+    """Dual-axis line chart of daily efficiency and on-time rate."""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Scatter(x=daily_trends["Date"], y=daily_trends["Avg Efficiency"], 
+                  name="Avg Efficiency", line=dict(color="#1f77b4")),
+        secondary_y=False
+    )
+    fig.add_trace(
+        go.Scatter(x=daily_trends["Date"], y=daily_trends["On-Time Rate"], 
+                  name="On-Time Rate %", line=dict(color="#2ca02c")),
+        secondary_y=True
+    )
+    fig.update_layout(title="Daily Performance Trends")
+    fig.update_yaxes(title_text="Efficiency Index", secondary_y=False)
+    fig.update_yaxes(title_text="On-Time Rate %", secondary_y=True)
+    return fig
+
+
+@st.cache_data
+def build_region_efficiency_chart(regions: pd.DataFrame) -> go.Figure:
+    """Bar chart of average efficiency per region."""
+    return px.bar(
+        regions.sort_values("avg_efficiency", ascending=False),
+        x="region",
+        y="avg_efficiency",
+        color="late_pickup_rate",
+        color_continuous_scale="RdYlGn_r",
+        title="Regional Efficiency Comparison"
+    )
+
+
+@st.cache_data
+def build_region_volume_chart(regions: pd.DataFrame) -> go.Figure:
+    """Pie chart of trip volume per region."""
+    return px.pie(
+        regions,
+        values="total_trips",
+        names="region",
+        title="Trip Distribution by Region"
+    )
+
+
+@st.cache_data
+def build_region_hour_heatmap(heatmap_data: pd.DataFrame) -> go.Figure:
+    """Heatmap of average efficiency by region and hour."""
+    return px.imshow(
+        heatmap_data,
+        labels=dict(x="Hour of Day", y="Region", color="Efficiency"),
+        color_continuous_scale="RdYlGn",
+        title="Efficiency Heatmap: Region vs Hour"
+    )
+
+
+@st.cache_data
+def build_strategy_comparison_chart(simulations: pd.DataFrame) -> go.Figure:
+    """Grouped bars of on-time rate and utilization per routing strategy."""
+    fig = go.Figure()
+    
+    metrics = ["on_time_rate", "utilization_rate"]
+    for metric in metrics:
+        fig.add_trace(go.Bar(
+            name=metric.replace("_", " ").title(),
+            x=simulations["strategy"],
+            y=simulations[metric],
+        ))
+    
+    fig.update_layout(
+        barmode="group",
+        title="Strategy Comparison: On-Time Rate & Utilization",
+        xaxis_title="Strategy",
+        yaxis_title="Percentage (%)"
+    )
+    return fig
+
+
+@st.cache_data
+def build_strategy_radar_chart(simulations: pd.DataFrame) -> go.Figure:
+    """Radar chart comparing normalized strategy metrics."""
+    categories = ["On-Time Rate", "Utilization", "Avg Duration", "Total Miles"]
+    
+    max_duration = simulations["avg_trip_duration"].max()
+    max_miles = simulations["total_miles"].max()
+    metric_cols = ["strategy", "on_time_rate", "utilization_rate", "avg_trip_duration", "total_miles"]
+    
+    fig = go.Figure()
+    for strategy, on_time, utilization, duration, miles in simulations[metric_cols].itertuples(index=False):
+        # Normalize values for radar chart
+        values = [
+            on_time / 100,  # Normalize to 0-1
+            utilization / 100,
+            1 - (duration / max_duration),  # Invert so lower is better
+            1 - (miles / max_miles),  # Invert so lower is better
+        ]
+        values.append(values[0])  # Close the radar
+        
+        fig.add_trace(go.Scatterpolar(
+            r=values,
+            theta=categories + [categories[0]],
+            name=strategy
+        ))
+    
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])))
+    return fig
+
+
 # Load data
-trips, drivers, simulations, evaluation, sensitivity = load_data()
+trips, trips_active, drivers, simulations, evaluation, sensitivity, rollup = load_data()
 
 if trips is None:
     st.warning("⚠️ No data available. Run the pipeline first:")
@@ -205,16 +440,20 @@ if trips is not None and "scheduled_pickup_time" in trips.columns:
     else:
         start_date = end_date = date_range if not isinstance(date_range, tuple) else date_range[0]
 
+# Categorical columns already hold their distinct values
+region_options = trips["region"].cat.categories.tolist()
+trip_type_options = trips["trip_type"].cat.categories.tolist()
+
 selected_regions = st.sidebar.multiselect(
     "Regions",
-    options=trips["region"].unique(),
-    default=trips["region"].unique()
+    options=region_options,
+    default=region_options
 )
 
 selected_trip_types = st.sidebar.multiselect(
     "Trip Types",
-    options=trips["trip_type"].unique(),
-    default=trips["trip_type"].unique()
+    options=trip_type_options,
+    default=trip_type_options
 )
 
 # Efficiency threshold filter
@@ -226,19 +465,35 @@ efficiency_threshold = st.sidebar.slider(
     help="Filter to trips with efficiency above this threshold"
 )
 
-# Filter data
-filtered_trips = trips[
-    (trips["region"].isin(selected_regions)) &
-    (trips["trip_type"].isin(selected_trip_types)) &
-    (~trips["is_cancelled"]) &
-    (trips["efficiency_index"] >= efficiency_threshold)
-]
+# Filter data with a single boolean mask over the underlying arrays
+region_codes = trips_active["region"].cat.categories.get_indexer(selected_regions)
+trip_type_codes = trips_active["trip_type"].cat.categories.get_indexer(selected_trip_types)
+mask = (
+    np.isin(trips_active["region"].cat.codes.to_numpy(), region_codes) &
+    np.isin(trips_active["trip_type"].cat.codes.to_numpy(), trip_type_codes) &
+    (trips_active["efficiency_index"].to_numpy() >= efficiency_threshold)
+)
 
 # Apply date filter if available
-if "scheduled_pickup_time" in trips.columns:
-    filtered_trips = filtered_trips[
-        (filtered_trips["scheduled_pickup_time"].dt.date >= start_date) &
-        (filtered_trips["scheduled_pickup_time"].dt.date <= end_date)
+if "scheduled_pickup_time" in trips_active.columns:
+    pickup_times = trips_active["scheduled_pickup_time"].to_numpy()
+    mask &= (
+        (pickup_times >= np.datetime64(start_date)) &
+        (pickup_times < np.datetime64(end_date) + np.timedelta64(1, "D"))
+    )
+
+filtered_trips = trips_active[mask]
+
+# The efficiency threshold is a per-trip filter the rollup cannot express,
+# so rebuild the rollup from the filtered trips when one is set
+if efficiency_threshold > 0:
+    filtered_rollup = build_rollup(filtered_trips)
+else:
+    filtered_rollup = rollup[
+        rollup["region"].isin(selected_regions) &
+        rollup["trip_type"].isin(selected_trip_types) &
+        (rollup["scheduled_date"] >= pd.Timestamp(start_date)) &
+        (rollup["scheduled_date"] <= pd.Timestamp(end_date))
     ]
 
 # Sidebar stats
@@ -255,7 +510,10 @@ st.sidebar.markdown("### 📥 Export Data")
 
 @st.cache_data
 def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
+    # Arrow's C++ CSV writer is much faster than DataFrame.to_csv
+    buf = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
 
 if st.sidebar.button("📄 Export Filtered Trips"):
     csv = convert_df_to_csv(filtered_trips)
@@ -279,7 +537,9 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 
 
 # Tab 1: Overview
-with tab1:
+@st.fragment
+def render_overview(filtered_trips: pd.DataFrame, filtered_rollup: pd.DataFrame) -> None:
+    """Render headline KPIs and the overview charts."""
     st.header("Overall Performance Metrics")
     
     # Handle empty filter results
@@ -291,7 +551,8 @@ with tab1:
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        on_time_rate = (1 - filtered_trips["is_late_pickup"].mean()) * 100
+        late_count = np.count_nonzero(filtered_trips["is_late_pickup"].to_numpy())
+        on_time_rate = (1 - late_count / len(filtered_trips)) * 100
         st.metric("On-Time Rate", f"{on_time_rate:.1f}%")
     
     with col2:
@@ -313,83 +574,54 @@ with tab1:
     
     with col1:
         st.subheader("Efficiency Distribution")
-        fig = px.histogram(
-            filtered_trips,
-            x="efficiency_index",
-            nbins=30,
+        fig = go.Figure(histogram_trace(
+            filtered_trips["efficiency_index"].to_numpy(),
+            bins=30,
+            marker_color="#1f77b4",
+        ))
+        fig.update_layout(
             title="Trip Efficiency Index Distribution",
-            color_discrete_sequence=["#1f77b4"]
+            xaxis_title="Efficiency Index",
+            yaxis_title="Count",
+            bargap=0,
         )
-        fig.update_layout(xaxis_title="Efficiency Index", yaxis_title="Count")
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("On-Time Performance by Hour")
-        hourly = filtered_trips.groupby("scheduled_hour").agg({
-            "is_late_pickup": lambda x: (1 - x.mean()) * 100,
-            "trip_id": "count"
-        }).reset_index()
+        hourly = summarize_rollup(filtered_rollup, "scheduled_hour")[
+            ["scheduled_hour", "on_time_rate", "trips"]
+        ]
         hourly.columns = ["Hour", "On-Time Rate", "Trip Count"]
-        
-        fig = px.bar(
-            hourly,
-            x="Hour",
-            y="On-Time Rate",
-            title="On-Time Rate by Hour of Day",
-            color="On-Time Rate",
-            color_continuous_scale="RdYlGn"
-        )
-        fig.update_layout(yaxis_title="On-Time Rate (%)")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_hourly_chart(hourly), use_container_width=True)
     
     # Trip type breakdown
     st.subheader("Performance by Trip Type")
-    trip_type_perf = filtered_trips.groupby("trip_type").agg({
-        "efficiency_index": "mean",
-        "is_late_pickup": lambda x: (1 - x.mean()) * 100,
-        "trip_id": "count"
-    }).reset_index()
+    trip_type_perf = summarize_rollup(filtered_rollup, "trip_type")[
+        ["trip_type", "avg_efficiency", "on_time_rate", "trips"]
+    ]
     trip_type_perf.columns = ["Trip Type", "Avg Efficiency", "On-Time Rate", "Count"]
-    
-    fig = px.bar(
-        trip_type_perf,
-        x="Trip Type",
-        y=["Avg Efficiency", "On-Time Rate"],
-        barmode="group",
-        title="Efficiency & On-Time Rate by Trip Type"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(build_trip_type_chart(trip_type_perf), use_container_width=True)
     
     # Time trend analysis
     st.subheader("📈 Daily Trend Analysis")
     
     if "scheduled_pickup_time" in filtered_trips.columns:
-        daily_trends = filtered_trips.groupby(filtered_trips["scheduled_pickup_time"].dt.date).agg({
-            "efficiency_index": "mean",
-            "is_late_pickup": lambda x: (1 - x.mean()) * 100,
-            "trip_id": "count"
-        }).reset_index()
+        daily_trends = summarize_rollup(filtered_rollup, "scheduled_date")[
+            ["scheduled_date", "avg_efficiency", "on_time_rate", "trips"]
+        ]
         daily_trends.columns = ["Date", "Avg Efficiency", "On-Time Rate", "Trip Count"]
-        
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-        fig.add_trace(
-            go.Scatter(x=daily_trends["Date"], y=daily_trends["Avg Efficiency"], 
-                      name="Avg Efficiency", line=dict(color="#1f77b4")),
-            secondary_y=False
-        )
-        fig.add_trace(
-            go.Scatter(x=daily_trends["Date"], y=daily_trends["On-Time Rate"], 
-                      name="On-Time Rate %", line=dict(color="#2ca02c")),
-            secondary_y=True
-        )
-        fig.update_layout(title="Daily Performance Trends")
-        fig.update_yaxes(title_text="Efficiency Index", secondary_y=False)
-        fig.update_yaxes(title_text="On-Time Rate %", secondary_y=True)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_daily_trend_chart(daily_trends), use_container_width=True)
+
+
+with tab1:
+    render_overview(filtered_trips, filtered_rollup)
 
 
 # Tab 2: Executive Summary
-with tab2:
+@st.fragment
+def render_executive_summary(filtered_trips: pd.DataFrame) -> None:
+    """Render bottlenecks, improvement potential and recommendations."""
     st.header("🎯 Executive Summary & Insights")
     
     # Calculate bottlenecks and improvement potential
@@ -461,7 +693,7 @@ with tab2:
         st.plotly_chart(fig, use_container_width=True)
         
         # Insights
-        peak_hour = worst_hours.iloc[0]["scheduled_hour"] if len(worst_hours) > 0 else "N/A"
+        peak_hour = worst_hours["scheduled_hour"].iat[0] if len(worst_hours) > 0 else "N/A"
         st.info(f"💡 **Insight:** Hour {peak_hour}:00 has the highest late pickup rate. Consider adding more drivers during this window.")
     
     with col2:
@@ -512,24 +744,31 @@ with tab2:
         """)
 
 
+with tab2:
+    render_executive_summary(filtered_trips)
+
+
 # Tab 3: Driver Performance
-with tab3:
+@st.fragment
+def render_driver_performance(filtered_trips: pd.DataFrame) -> None:
+    """Render driver rankings and score breakdowns."""
     st.header("Driver Performance Analysis")
     
-    # Compute driver stats from trips
-    driver_stats = filtered_trips[~filtered_trips["is_cancelled"]].groupby("driver_id").agg({
-        "trip_id": "count",
-        "efficiency_index": "mean",
-        "is_late_pickup": "mean",
-        "score_on_time": "mean",
-        "score_route": "mean",
-        "score_capacity": "mean",
-        "score_idle": "mean",
-        "distance_miles": "sum"
-    }).reset_index()
-    driver_stats.columns = ["driver_id", "total_trips", "avg_efficiency", "late_pickup_rate",
-                            "avg_on_time_score", "avg_route_score", "avg_capacity_score", 
-                            "avg_idle_score", "total_miles"]
+    # Compute driver stats from trips in one named-aggregation pass
+    driver_cols = [
+        "driver_id", "trip_id", "efficiency_index", "is_late_pickup",
+        "score_on_time", "score_route", "score_capacity", "score_idle", "distance_miles",
+    ]
+    driver_stats = filtered_trips[driver_cols].groupby("driver_id", observed=True, sort=False).agg(
+        total_trips=("trip_id", "size"),
+        avg_efficiency=("efficiency_index", "mean"),
+        late_pickup_rate=("is_late_pickup", "mean"),
+        avg_on_time_score=("score_on_time", "mean"),
+        avg_route_score=("score_route", "mean"),
+        avg_capacity_score=("score_capacity", "mean"),
+        avg_idle_score=("score_idle", "mean"),
+        total_miles=("distance_miles", "sum"),
+    ).reset_index()
     driver_stats = driver_stats.sort_values("avg_efficiency", ascending=False)
     
     col1, col2 = st.columns([2, 1])
@@ -600,32 +839,27 @@ with tab3:
     st.plotly_chart(fig, use_container_width=True)
 
 
+with tab3:
+    render_driver_performance(filtered_trips)
+
+
 # Tab 4: Regional Analysis
-with tab4:
+@st.fragment
+def render_regional_analysis(filtered_rollup: pd.DataFrame) -> None:
+    """Render regional comparisons from the filtered rollup."""
     st.header("Regional Performance Analysis")
     
     # Compute region stats from trips
-    regions = filtered_trips.groupby("region").agg({
-        "trip_id": "count",
-        "efficiency_index": "mean",
-        "is_late_pickup": "mean",
-        "distance_miles": "mean"
-    }).reset_index()
+    regions = summarize_rollup(filtered_rollup, "region")[
+        ["region", "trips", "avg_efficiency", "late_pickup_rate", "avg_distance"]
+    ]
     regions.columns = ["region", "total_trips", "avg_efficiency", "late_pickup_rate", "avg_distance"]
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Efficiency by Region")
-        fig = px.bar(
-            regions.sort_values("avg_efficiency", ascending=False),
-            x="region",
-            y="avg_efficiency",
-            color="late_pickup_rate",
-            color_continuous_scale="RdYlGn_r",
-            title="Regional Efficiency Comparison"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_region_efficiency_chart(regions), use_container_width=True)
     
     with col2:
         st.subheader("Region Statistics")
@@ -640,55 +874,29 @@ with tab4:
     
     # Regional trends
     st.subheader("Trip Volume by Region")
-    fig = px.pie(
-        regions,
-        values="total_trips",
-        names="region",
-        title="Trip Distribution by Region"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(build_region_volume_chart(regions), use_container_width=True)
     
     # Regional heatmap by hour
     st.subheader("Regional Performance by Hour")
-    region_hour = filtered_trips.groupby(["region", "scheduled_hour"]).agg({
-        "efficiency_index": "mean"
-    }).reset_index()
-    
-    heatmap_data = region_hour.pivot(index="region", columns="scheduled_hour", values="efficiency_index")
-    fig = px.imshow(
-        heatmap_data,
-        labels=dict(x="Hour of Day", y="Region", color="Efficiency"),
-        color_continuous_scale="RdYlGn",
-        title="Efficiency Heatmap: Region vs Hour"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    heatmap_data = region_hour_grid(filtered_rollup)
+    st.plotly_chart(build_region_hour_heatmap(heatmap_data), use_container_width=True)
+
+
+with tab4:
+    render_regional_analysis(filtered_rollup)
 
 
 # Tab 5: Routing Simulation
-with tab5:
+@st.fragment
+def render_routing_simulation(simulations: pd.DataFrame, sensitivity: pd.DataFrame) -> None:
+    """Render the routing strategy comparison."""
     st.header("Routing Strategy Comparison")
     
     if simulations is not None and len(simulations) > 0:
         st.subheader("Strategy Performance Metrics")
         
         # Comparison chart
-        fig = go.Figure()
-        
-        metrics = ["on_time_rate", "utilization_rate"]
-        for metric in metrics:
-            fig.add_trace(go.Bar(
-                name=metric.replace("_", " ").title(),
-                x=simulations["strategy"],
-                y=simulations[metric],
-            ))
-        
-        fig.update_layout(
-            barmode="group",
-            title="Strategy Comparison: On-Time Rate & Utilization",
-            xaxis_title="Strategy",
-            yaxis_title="Percentage (%)"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_strategy_comparison_chart(simulations), use_container_width=True)
         
         # Details table
         st.subheader("Detailed Results")
@@ -702,7 +910,7 @@ with tab5:
         )
         
         # Recommendation
-        best_strategy = simulations.loc[simulations["on_time_rate"].idxmax(), "strategy"]
+        best_strategy = simulations["strategy"].iat[int(simulations["on_time_rate"].to_numpy().argmax())]
         st.success(f"🏆 **Recommended Strategy:** {best_strategy} (highest on-time rate)")
         
         # Sensitivity Analysis
@@ -728,34 +936,20 @@ with tab5:
         
         # Strategy comparison radar
         st.subheader("Strategy Comparison Radar")
-        categories = ["On-Time Rate", "Utilization", "Avg Duration", "Total Miles"]
-        
-        fig = go.Figure()
-        for _, row in simulations.iterrows():
-            # Normalize values for radar chart
-            values = [
-                row["on_time_rate"] / 100,  # Normalize to 0-1
-                row["utilization_rate"] / 100,
-                1 - (row["avg_trip_duration"] / simulations["avg_trip_duration"].max()),  # Invert so lower is better
-                1 - (row["total_miles"] / simulations["total_miles"].max()),  # Invert so lower is better
-            ]
-            values.append(values[0])  # Close the radar
-            
-            fig.add_trace(go.Scatterpolar(
-                r=values,
-                theta=categories + [categories[0]],
-                name=row["strategy"]
-            ))
-        
-        fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_strategy_radar_chart(simulations), use_container_width=True)
         
     else:
         st.warning("No simulation results available. Run the routing simulation first.")
 
 
+with tab5:
+    render_routing_simulation(simulations, sensitivity)
+
+
 # Tab 6: Trip Details
-with tab6:
+@st.fragment
+def render_trip_details(filtered_trips: pd.DataFrame) -> None:
+    """Render trip search, detail table and worst trips."""
     st.header("🔍 Trip-Level Analysis")
     
     st.markdown("Explore individual trips and identify specific issues.")
@@ -773,21 +967,23 @@ with tab6:
     with col3:
         show_late_only = st.checkbox("Show Late Pickups Only")
     
-    # Apply search filters
-    detail_trips = filtered_trips.copy()
+    # Build the search filters as one mask; only the displayed rows get copied
+    efficiency = filtered_trips["efficiency_index"].to_numpy()
+    detail_mask = (efficiency >= min_efficiency) & (efficiency <= max_efficiency)
     
     if search_driver:
-        detail_trips = detail_trips[detail_trips["driver_id"].str.contains(search_driver, case=False, na=False)]
-    
-    detail_trips = detail_trips[
-        (detail_trips["efficiency_index"] >= min_efficiency) &
-        (detail_trips["efficiency_index"] <= max_efficiency)
-    ]
+        driver_ids = filtered_trips["driver_id"]
+        search_id = search_driver.strip().upper()
+        if search_id in driver_ids.cat.categories:
+            # Exact ID: a single integer compare over the category codes
+            detail_mask &= driver_ids.cat.codes.to_numpy() == driver_ids.cat.categories.get_loc(search_id)
+        else:
+            detail_mask &= driver_ids.str.contains(search_driver, case=False, regex=False, na=False).to_numpy()
     
     if show_late_only:
-        detail_trips = detail_trips[detail_trips["is_late_pickup"] == True]
+        detail_mask &= filtered_trips["is_late_pickup"].to_numpy() == True
     
-    st.markdown(f"**Showing {len(detail_trips):,} trips**")
+    st.markdown(f"**Showing {detail_mask.sum():,} trips**")
     
     # Display columns selection
     display_cols = [
@@ -795,11 +991,15 @@ with tab6:
         "scheduled_pickup_time", "efficiency_index", 
         "is_late_pickup", "pickup_delay_minutes", "distance_miles"
     ]
-    available_cols = [c for c in display_cols if c in detail_trips.columns]
+    available_cols = [c for c in display_cols if c in filtered_trips.columns]
+    
+    # Rank on the efficiency column alone, then project just the 100 shown rows
+    detail_rows = filtered_trips["efficiency_index"][detail_mask].nsmallest(100).index
+    detail_trips = filtered_trips.loc[detail_rows, available_cols]
     
     # Interactive data table
     st.dataframe(
-        detail_trips[available_cols].sort_values("efficiency_index").head(100).style.format({
+        detail_trips.style.format({
             "efficiency_index": "{:.1f}",
             "pickup_delay_minutes": "{:.1f}",
             "distance_miles": "{:.1f}"
@@ -810,20 +1010,32 @@ with tab6:
     
     # Trip distribution
     st.subheader("Trip Efficiency Distribution")
-    fig = px.histogram(
-        detail_trips,
-        x="efficiency_index",
-        nbins=50,
-        color="is_late_pickup",
+    detail_efficiency = efficiency[detail_mask]
+    detail_late = filtered_trips["is_late_pickup"].to_numpy()[detail_mask]
+    bin_edges = np.histogram_bin_edges(detail_efficiency, bins=50)
+    
+    fig = go.Figure()
+    for is_late, name, color in [(False, "On-Time", "#2ca02c"), (True, "Late", "#d62728")]:
+        fig.add_trace(histogram_trace(
+            detail_efficiency[detail_late == is_late],
+            bins=bin_edges,
+            name=name,
+            marker_color=color,
+            opacity=0.6,
+        ))
+    fig.update_layout(
         barmode="overlay",
+        bargap=0,
         title="Efficiency Distribution (Late vs On-Time)",
-        color_discrete_map={True: "#d62728", False: "#2ca02c"}
+        xaxis_title="Efficiency Index",
+        yaxis_title="Count",
     )
     st.plotly_chart(fig, use_container_width=True)
     
     # Outlier analysis
     st.subheader("⚠️ Worst Performing Trips")
-    worst_trips = filtered_trips.nsmallest(10, "efficiency_index")[available_cols]
+    worst_rows = filtered_trips["efficiency_index"].nsmallest(10).index
+    worst_trips = filtered_trips.loc[worst_rows, available_cols]
     st.dataframe(
         worst_trips.style.format({
             "efficiency_index": "{:.1f}",
@@ -834,6 +1046,10 @@ with tab6:
     )
 
 
+with tab6:
+    render_trip_details(filtered_trips)
+
+
 # Footer
 st.markdown("---")
 col1, col2, col3 = st.columns(3)
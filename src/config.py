@@ -58,3 +58,6 @@ IDLE_THRESHOLD_MINUTES = 15  # Excessive idle time threshold
 # Vehicle settings
 VEHICLE_CAPACITIES = [1, 2, 4, 6]  # Possible vehicle capacities
 DEFAULT_VEHICLE_CAPACITY = 4
+
+# Low-cardinality string columns stored as pandas categoricals after loading
+CATEGORICAL_COLUMNS = ["driver_id", "region", "trip_type", "cancellation_reason"]
@@ -5,19 +5,29 @@ import numpy as np
 from typing import Optional
 
 from .config import RAW_DIR, INTERIM_DIR, LATE_THRESHOLD_MINUTES
-from .utils import haversine_distance, minutes_between
+from .utils import categorize_columns, haversine_distance, minutes_between_series
+
+
+# Coordinates and distances only need single precision
+FLOAT32_COLUMNS = {
+    "pickup_lat": "float32",
+    "pickup_lng": "float32",
+    "dropoff_lat": "float32",
+    "dropoff_lng": "float32",
+    "distance_miles": "float32",
+}
 
 
 def load_raw_trips(filename: str = "trips.csv") -> pd.DataFrame:
     """Load raw trip data."""
     filepath = RAW_DIR / filename
-    df = pd.read_csv(filepath, parse_dates=[
+    df = pd.read_csv(filepath, engine="pyarrow", dtype=FLOAT32_COLUMNS, parse_dates=[
         "requested_pickup_time",
         "scheduled_pickup_time",
         "actual_pickup_time",
         "actual_dropoff_time",
     ])
-    return df
+    return categorize_columns(df)
 
 
 def clean_trips(df: pd.DataFrame) -> pd.DataFrame:
@@ -29,9 +39,10 @@ def clean_trips(df: pd.DataFrame) -> pd.DataFrame:
     - Recalculate distances if needed
     - Standardize timestamps
     - Add derived time columns
-    """
-    df = df.copy()
     
+    The input frame is not modified: dropping invalid rows already yields
+    a new frame, so no defensive copy is taken.
+    """
     # Remove trips with invalid coordinates
     coord_cols = ["pickup_lat", "pickup_lng", "dropoff_lat", "dropoff_lng"]
     df = df.dropna(subset=coord_cols)
@@ -46,43 +57,31 @@ def clean_trips(df: pd.DataFrame) -> pd.DataFrame:
     df = df[valid_coords]
     
     # Recalculate distance for consistency
-    df["distance_miles_calc"] = df.apply(
-        lambda row: haversine_distance(
-            row["pickup_lat"], row["pickup_lng"],
-            row["dropoff_lat"], row["dropoff_lng"]
-        ),
-        axis=1
+    df["distance_miles_calc"] = haversine_distance(
+        df["pickup_lat"].to_numpy(), df["pickup_lng"].to_numpy(),
+        df["dropoff_lat"].to_numpy(), df["dropoff_lng"].to_numpy(),
     )
     
     # Add time-derived columns
     df["scheduled_date"] = df["scheduled_pickup_time"].dt.date
     df["scheduled_hour"] = df["scheduled_pickup_time"].dt.hour
     df["scheduled_day_of_week"] = df["scheduled_pickup_time"].dt.dayofweek
-    df["is_weekend"] = df["scheduled_day_of_week"].isin([5, 6])
+    df["is_weekend"] = df["scheduled_day_of_week"].to_numpy() >= 5
     
     # Flag cancelled trips FIRST (before computing time-based features)
     df["is_cancelled"] = df["cancellation_reason"].notna()
     
+    cancelled = df["is_cancelled"].to_numpy()
+    
     # Calculate pickup delay (only for non-cancelled trips)
-    df["pickup_delay_minutes"] = np.nan
-    non_cancelled_mask = ~df["is_cancelled"]
-    df.loc[non_cancelled_mask, "pickup_delay_minutes"] = df.loc[non_cancelled_mask].apply(
-        lambda row: minutes_between(
-            row["scheduled_pickup_time"],
-            row["actual_pickup_time"]
-        ),
-        axis=1
-    )
+    delay = minutes_between_series(df["scheduled_pickup_time"], df["actual_pickup_time"])
+    delay[cancelled] = np.nan
+    df["pickup_delay_minutes"] = delay
     
     # Calculate trip duration (only for non-cancelled trips)
-    df["trip_duration_minutes"] = np.nan
-    df.loc[non_cancelled_mask, "trip_duration_minutes"] = df.loc[non_cancelled_mask].apply(
-        lambda row: minutes_between(
-            row["actual_pickup_time"],
-            row["actual_dropoff_time"]
-        ),
-        axis=1
-    )
+    duration = minutes_between_series(df["actual_pickup_time"], df["actual_dropoff_time"])
+    duration[cancelled] = np.nan
+    df["trip_duration_minutes"] = duration
     
     # Recalculate late flags based on threshold (NaN for cancelled trips)
     df["is_late_pickup"] = df["pickup_delay_minutes"] > LATE_THRESHOLD_MINUTES
@@ -90,17 +89,17 @@ def clean_trips(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def save_cleaned_data(df: pd.DataFrame, filename: str = "trips_cleaned.csv") -> None:
-    """Save cleaned data to interim directory."""
+def save_cleaned_data(df: pd.DataFrame, filename: str = "trips_cleaned.parquet") -> None:
+    """Save cleaned data to interim directory (Parquet keeps dtypes for the next stage)."""
     INTERIM_DIR.mkdir(parents=True, exist_ok=True)
     filepath = INTERIM_DIR / filename
-    df.to_csv(filepath, index=False)
+    df.to_parquet(filepath, index=False, compression="zstd")
     print(f"Saved {len(df)} cleaned trips to {filepath}")
 
 
 def run_cleaning_pipeline(
     input_file: str = "trips.csv",
-    output_file: str = "trips_cleaned.csv"
+    output_file: str = "trips_cleaned.parquet"
 ) -> pd.DataFrame:
     """Run full cleaning pipeline."""
     print("Loading raw data...")
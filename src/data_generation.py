@@ -24,6 +24,11 @@ fake = Faker()
 Faker.seed(RANDOM_SEED)
 
 
+def _format_ids(prefix: str, numbers: np.ndarray, width: int) -> np.ndarray:
+    """Format integer IDs as zero-padded strings, e.g. ("DRV_", 7, 4) -> "DRV_0007"."""
+    return np.char.add(prefix, np.char.zfill(numbers.astype(str), width))
+
+
 def generate_trips(
     num_trips: int = DEFAULT_NUM_TRIPS,
     num_drivers: int = DEFAULT_NUM_DRIVERS,
@@ -53,98 +58,96 @@ def generate_trips(
     if end_date is None:
         end_date = datetime(2025, 3, 31)
     
-    # Generate base data
-    trips = []
-    
     regions = [f"Region_{i+1}" for i in range(num_regions)]
-    driver_ids = [f"DRV_{i:04d}" for i in range(num_drivers)]
-    member_ids = [f"MBR_{i:06d}" for i in range(num_trips * 2)]  # More members than trips
+    num_members = num_trips * 2  # More members than trips
     
     trip_type_names = list(TRIP_TYPES.keys())
     trip_type_probs = list(TRIP_TYPES.values())
     
-    for i in range(num_trips):
-        # Random date within range
-        days_range = (end_date - start_date).days
-        trip_date = start_date + timedelta(days=np.random.randint(0, days_range))
-        
-        # Random time within operating hours
-        hour = np.random.randint(OPERATING_HOURS["start"], OPERATING_HOURS["end"])
-        minute = np.random.choice([0, 15, 30, 45])
-        requested_time = trip_date.replace(hour=hour, minute=minute, second=0)
-        
-        # Scheduled time (usually within 30 min of requested)
-        schedule_offset = int(np.random.randint(-15, 30))
-        scheduled_time = requested_time + timedelta(minutes=schedule_offset)
-        
-        # Actual pickup time (with some variance and potential delays)
-        delay_minutes = int(np.random.choice(
-            [-5, 0, 0, 0, 5, 10, 15, 20, 30],  # Weighted toward on-time
-            p=[0.05, 0.30, 0.25, 0.15, 0.10, 0.07, 0.04, 0.02, 0.02]
-        ))
-        actual_pickup = scheduled_time + timedelta(minutes=delay_minutes)
-        
-        # Generate coordinates
-        pickup_lat = np.random.uniform(GEO_BOUNDS["lat_min"], GEO_BOUNDS["lat_max"])
-        pickup_lng = np.random.uniform(GEO_BOUNDS["lng_min"], GEO_BOUNDS["lng_max"])
-        
-        # Dropoff typically within reasonable distance
-        dropoff_lat = pickup_lat + np.random.uniform(-0.1, 0.1)
-        dropoff_lng = pickup_lng + np.random.uniform(-0.1, 0.1)
-        
-        # Calculate distance
-        distance = haversine_distance(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)
-        
-        # Travel time based on distance (avg 25 mph in urban)
-        travel_minutes = (distance / 25) * 60 + np.random.randint(5, 15)
-        actual_dropoff = actual_pickup + timedelta(minutes=travel_minutes)
-        
-        # Vehicle and passengers
-        vehicle_capacity = np.random.choice(VEHICLE_CAPACITIES)
-        num_passengers = np.random.randint(1, min(vehicle_capacity, 3) + 1)
-        
-        # Late flags
-        late_pickup = delay_minutes > 10
-        expected_dropoff = scheduled_time + timedelta(minutes=(distance / 25) * 60 + 10)
-        late_dropoff = actual_dropoff > expected_dropoff + timedelta(minutes=10)
-        
-        # Cancellation (small percentage)
-        cancelled = np.random.random() < 0.03
-        cancellation_reason = None
-        if cancelled:
-            cancellation_reason = np.random.choice([
-                "member_no_show",
-                "member_cancelled",
-                "driver_unavailable",
-                "weather",
-                "vehicle_issue",
-            ])
-            actual_pickup = None
-            actual_dropoff = None
-        
-        trips.append({
-            "trip_id": f"TRP_{i:06d}",
-            "member_id": np.random.choice(member_ids),
-            "driver_id": np.random.choice(driver_ids),
-            "pickup_lat": pickup_lat,
-            "pickup_lng": pickup_lng,
-            "dropoff_lat": dropoff_lat,
-            "dropoff_lng": dropoff_lng,
-            "requested_pickup_time": requested_time,
-            "scheduled_pickup_time": scheduled_time,
-            "actual_pickup_time": actual_pickup,
-            "actual_dropoff_time": actual_dropoff,
-            "distance_miles": round(distance, 2),
-            "trip_type": np.random.choice(trip_type_names, p=trip_type_probs),
-            "vehicle_capacity": vehicle_capacity,
-            "num_passengers": num_passengers,
-            "late_pickup_flag": late_pickup if not cancelled else None,
-            "late_dropoff_flag": late_dropoff if not cancelled else None,
-            "cancellation_reason": cancellation_reason,
-            "region": np.random.choice(regions),
-        })
-    
-    return pd.DataFrame(trips)
+    # Each field is drawn for all trips at once (one column per array)
+    # Random date within range, random time within operating hours
+    days_range = (end_date - start_date).days
+    day_offsets = np.random.randint(0, days_range, size=num_trips)
+    hours = np.random.randint(OPERATING_HOURS["start"], OPERATING_HOURS["end"], size=num_trips)
+    minutes = np.random.choice([0, 15, 30, 45], size=num_trips)
+    requested_time = (
+        pd.Timestamp(start_date).normalize()
+        + pd.to_timedelta(day_offsets, unit="D")
+        + pd.to_timedelta(hours * 60 + minutes, unit="min")
+    )
+    
+    # Scheduled time (usually within 30 min of requested)
+    schedule_offset = np.random.randint(-15, 30, size=num_trips)
+    scheduled_time = requested_time + pd.to_timedelta(schedule_offset, unit="min")
+    
+    # Actual pickup time (with some variance and potential delays)
+    delay_minutes = np.random.choice(
+        [-5, 0, 0, 0, 5, 10, 15, 20, 30],  # Weighted toward on-time
+        size=num_trips,
+        p=[0.05, 0.30, 0.25, 0.15, 0.10, 0.07, 0.04, 0.02, 0.02]
+    )
+    actual_pickup = scheduled_time + pd.to_timedelta(delay_minutes, unit="min")
+    
+    # Generate coordinates
+    pickup_lat = np.random.uniform(GEO_BOUNDS["lat_min"], GEO_BOUNDS["lat_max"], size=num_trips)
+    pickup_lng = np.random.uniform(GEO_BOUNDS["lng_min"], GEO_BOUNDS["lng_max"], size=num_trips)
+    
+    # Dropoff typically within reasonable distance
+    dropoff_lat = pickup_lat + np.random.uniform(-0.1, 0.1, size=num_trips)
+    dropoff_lng = pickup_lng + np.random.uniform(-0.1, 0.1, size=num_trips)
+    
+    # Calculate distance
+    distance = haversine_distance(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)
+    
+    # Travel time based on distance (avg 25 mph in urban)
+    travel_minutes = (distance / 25) * 60 + np.random.randint(5, 15, size=num_trips)
+    actual_dropoff = actual_pickup + pd.to_timedelta(travel_minutes, unit="min").round("us")
+    
+    # Vehicle and passengers
+    vehicle_capacity = np.random.choice(VEHICLE_CAPACITIES, size=num_trips)
+    num_passengers = np.random.randint(1, np.minimum(vehicle_capacity, 3) + 1)
+    
+    # Late flags
+    late_pickup = delay_minutes > 10
+    expected_dropoff = scheduled_time + pd.to_timedelta((distance / 25) * 60 + 10, unit="min")
+    late_dropoff = actual_dropoff > expected_dropoff + pd.Timedelta(minutes=10)
+    
+    # Cancellation (small percentage)
+    cancelled = np.random.random(num_trips) < 0.03
+    cancellation_reason = np.where(
+        cancelled,
+        np.random.choice([
+            "member_no_show",
+            "member_cancelled",
+            "driver_unavailable",
+            "weather",
+            "vehicle_issue",
+        ], size=num_trips),
+        None,
+    )
+    
+    return pd.DataFrame({
+        "trip_id": _format_ids("TRP_", np.arange(num_trips), 6),
+        # Same draws as np.random.choice over the ID lists, formatted only once chosen
+        "member_id": _format_ids("MBR_", np.random.randint(0, num_members, size=num_trips), 6),
+        "driver_id": _format_ids("DRV_", np.random.randint(0, num_drivers, size=num_trips), 4),
+        "pickup_lat": pickup_lat,
+        "pickup_lng": pickup_lng,
+        "dropoff_lat": dropoff_lat,
+        "dropoff_lng": dropoff_lng,
+        "requested_pickup_time": requested_time,
+        "scheduled_pickup_time": scheduled_time,
+        "actual_pickup_time": actual_pickup.where(~cancelled),
+        "actual_dropoff_time": actual_dropoff.where(~cancelled),
+        "distance_miles": np.round(distance, 2),
+        "trip_type": np.random.choice(trip_type_names, size=num_trips, p=trip_type_probs),
+        "vehicle_capacity": vehicle_capacity,
+        "num_passengers": num_passengers,
+        "late_pickup_flag": np.where(cancelled, None, late_pickup),
+        "late_dropoff_flag": np.where(cancelled, None, late_dropoff),
+        "cancellation_reason": cancellation_reason,
+        "region": np.random.choice(regions, size=num_trips),
+    })
 
 
 def generate_drivers(
@@ -167,24 +170,37 @@ def generate_drivers(
     
     regions = [f"Region_{i+1}" for i in range(num_regions)]
     
-    drivers = []
+    # Pre-sized column arrays filled in draw order (same stream as row-by-row dicts)
+    driver_names = np.empty(num_drivers, dtype=object)
+    vehicle_capacity = np.empty(num_drivers, dtype=np.int64)
+    region = np.empty(num_drivers, dtype=object)
+    home_lat = np.empty(num_drivers)
+    home_lng = np.empty(num_drivers)
+    years_experience = np.empty(num_drivers, dtype=np.int64)
+    rating = np.empty(num_drivers)
+    is_active = np.empty(num_drivers, dtype=bool)
+    
     for i in range(num_drivers):
-        lat = np.random.uniform(GEO_BOUNDS["lat_min"], GEO_BOUNDS["lat_max"])
-        lng = np.random.uniform(GEO_BOUNDS["lng_min"], GEO_BOUNDS["lng_max"])
-        
-        drivers.append({
-            "driver_id": f"DRV_{i:04d}",
-            "driver_name": fake.name(),
-            "vehicle_capacity": np.random.choice(VEHICLE_CAPACITIES),
-            "region": np.random.choice(regions),
-            "home_lat": lat,
-            "home_lng": lng,
-            "years_experience": np.random.randint(1, 15),
-            "rating": round(np.random.uniform(3.5, 5.0), 2),
-            "is_active": np.random.random() > 0.05,  # 95% active
-        })
-    
-    return pd.DataFrame(drivers)
+        home_lat[i] = np.random.uniform(GEO_BOUNDS["lat_min"], GEO_BOUNDS["lat_max"])
+        home_lng[i] = np.random.uniform(GEO_BOUNDS["lng_min"], GEO_BOUNDS["lng_max"])
+        driver_names[i] = fake.name()
+        vehicle_capacity[i] = np.random.choice(VEHICLE_CAPACITIES)
+        region[i] = np.random.choice(regions)
+        years_experience[i] = np.random.randint(1, 15)
+        rating[i] = round(np.random.uniform(3.5, 5.0), 2)
+        is_active[i] = np.random.random() > 0.05  # 95% active
+    
+    return pd.DataFrame({
+        "driver_id": [f"DRV_{i:04d}" for i in range(num_drivers)],
+        "driver_name": driver_names,
+        "vehicle_capacity": vehicle_capacity,
+        "region": region,
+        "home_lat": home_lat,
+        "home_lng": home_lng,
+        "years_experience": years_experience,
+        "rating": rating,
+        "is_active": is_active,
+    })
 
 
 def save_raw_data(df: pd.DataFrame, filename: str = "trips.csv") -> None:
@@ -14,17 +14,16 @@ def calculate_on_time_score(df: pd.DataFrame) -> pd.Series:
     Higher is better. Based on pickup delay.
     Cancelled trips get NaN score (not included in aggregates).
     """
-    # Start with NaN for all rows
-    score = pd.Series(np.nan, index=df.index)
-    
-    # Only score non-cancelled trips
-    non_cancelled = ~df["is_cancelled"]
+    # Only score non-cancelled trips; cancelled rows are set to NaN below
+    cancelled = df["is_cancelled"].to_numpy(dtype=bool)
     
     # Convert delay to score: 0 delay = 100, 30+ min delay = 0
-    delay = df.loc[non_cancelled, "pickup_delay_minutes"].fillna(0).clip(lower=-10, upper=30)
-    score.loc[non_cancelled] = (100 - ((delay + 10) / 40 * 100)).clip(0, 100)
+    delay = np.nan_to_num(df["pickup_delay_minutes"].to_numpy(dtype=np.float32), nan=0.0)
+    np.clip(delay, -10, 30, out=delay)
+    score = np.clip(100 - ((delay + 10) / 40 * 100), 0, 100)
+    score[cancelled] = np.nan
     
-    return score
+    return pd.Series(score, index=df.index)
 
 
 def calculate_route_deviation_score(df: pd.DataFrame) -> pd.Series:
@@ -34,15 +33,15 @@ def calculate_route_deviation_score(df: pd.DataFrame) -> pd.Series:
     Compares actual travel time to expected based on distance.
     """
     # Expected time at 25 mph average
-    expected_minutes = (df["distance_miles"] / 25) * 60
-    actual_minutes = df["trip_duration_minutes"]
+    expected_minutes = (df["distance_miles"].to_numpy(dtype=np.float32) / 25) * 60
+    actual_minutes = df["trip_duration_minutes"].to_numpy(dtype=np.float32)
     
     # Deviation ratio
-    deviation = (actual_minutes - expected_minutes) / expected_minutes.replace(0, 1)
+    deviation = (actual_minutes - expected_minutes) / np.where(expected_minutes == 0, 1, expected_minutes)
     
     # Score: 0% deviation = 100, 100%+ deviation = 0
-    score = 100 - (deviation.clip(0, 1) * 100)
-    return score.clip(0, 100)
+    np.clip(deviation, 0, 1, out=deviation)
+    return pd.Series(100 - deviation * 100, index=df.index)
 
 
 def calculate_capacity_score(df: pd.DataFrame) -> pd.Series:
@@ -51,9 +50,9 @@ def calculate_capacity_score(df: pd.DataFrame) -> pd.Series:
     
     Based on passenger-to-capacity ratio.
     """
-    utilization = df["capacity_utilization"].fillna(0)
+    utilization = np.nan_to_num(df["capacity_utilization"].to_numpy(dtype=np.float32), nan=0.0)
     # Score directly from utilization percentage
-    return (utilization * 100).clip(0, 100)
+    return pd.Series(np.clip(utilization * 100, 0, 100), index=df.index)
 
 
 def calculate_idle_score(df: pd.DataFrame) -> pd.Series:
@@ -64,11 +63,11 @@ def calculate_idle_score(df: pd.DataFrame) -> pd.Series:
     """
     # Productive ratio: trip minutes / total minutes in shift (assume 8 hours)
     shift_minutes = 480  # 8 hours
-    productive_ratio = df["daily_minutes"].fillna(0) / shift_minutes
+    productive_ratio = np.nan_to_num(df["daily_minutes"].to_numpy(dtype=np.float32), nan=0.0) / shift_minutes
     
     # Score based on productive ratio (50%+ productive = 100)
-    score = (productive_ratio / 0.5 * 100).clip(0, 100)
-    return score
+    score = np.clip(productive_ratio / 0.5 * 100, 0, 100)
+    return pd.Series(score, index=df.index)
 
 
 def calculate_efficiency_index(
@@ -83,49 +82,60 @@ def calculate_efficiency_index(
         weights: Custom weights for scoring components
         
     Returns:
-        DataFrame with efficiency scores added
+        df with efficiency scores added as float32 columns. Columns are
+        added in place; pass a copy to keep the input unchanged.
     """
     if weights is None:
         weights = EFFICIENCY_WEIGHTS
     
-    df = df.copy()
-    
     # Calculate component scores
     df["score_on_time"] = calculate_on_time_score(df)
     df["score_route"] = calculate_route_deviation_score(df)
     df["score_capacity"] = calculate_capacity_score(df)
     df["score_idle"] = calculate_idle_score(df)
     
-    # Weighted average
-    df["efficiency_index"] = (
-        df["score_on_time"] * weights["on_time_performance"] +
-        df["score_route"] * weights["route_deviation"] +
-        df["score_capacity"] * weights["capacity_utilization"] +
-        df["score_idle"] * weights["idle_time"]
-    )
+    # Weighted average as one (N, 4) @ (4,) product
+    components = np.column_stack([
+        df["score_on_time"], df["score_route"], df["score_capacity"], df["score_idle"]
+    ])
+    weight_vec = np.array([
+        weights["on_time_performance"],
+        weights["route_deviation"],
+        weights["capacity_utilization"],
+        weights["idle_time"],
+    ], dtype=np.float32)
+    df["efficiency_index"] = components @ weight_vec
     
     return df
 
 
-def score_drivers(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate efficiency scores by driver."""
-    active = df[~df["is_cancelled"]]
-    
-    driver_scores = active.groupby("driver_id").agg({
-        "efficiency_index": "mean",
-        "score_on_time": "mean",
-        "score_route": "mean",
-        "score_capacity": "mean",
-        "score_idle": "mean",
-        "trip_id": "count",
-        "is_late_pickup": "mean",
-    }).reset_index()
+# Columns read by score_drivers and score_regions
+SCORE_AGG_COLUMNS = [
+    "driver_id", "region", "trip_id", "is_late_pickup", "distance_miles",
+    "efficiency_index", "score_on_time", "score_route", "score_capacity", "score_idle",
+]
+
+
+def score_drivers(df: pd.DataFrame, active: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Aggregate efficiency scores by driver.
     
-    driver_scores.columns = [
-        "driver_id", "avg_efficiency", "avg_on_time_score",
-        "avg_route_score", "avg_capacity_score", "avg_idle_score",
-        "total_trips", "late_pickup_rate"
-    ]
+    Args:
+        df: Scored trip data
+        active: Non-cancelled subset of df, if already computed by the caller
+    """
+    if active is None:
+        active = df[~df["is_cancelled"]]
+    
+    driver_scores = active.groupby("driver_id", observed=True, sort=False).agg(
+        avg_efficiency=("efficiency_index", "mean"),
+        avg_on_time_score=("score_on_time", "mean"),
+        avg_route_score=("score_route", "mean"),
+        avg_capacity_score=("score_capacity", "mean"),
+        avg_idle_score=("score_idle", "mean"),
+        total_trips=("trip_id", "count"),
+        late_pickup_rate=("is_late_pickup", "mean"),
+    ).reset_index()
     
     driver_scores = driver_scores.sort_values("avg_efficiency", ascending=False)
     driver_scores["efficiency_rank"] = range(1, len(driver_scores) + 1)
@@ -133,22 +143,24 @@ def score_drivers(df: pd.DataFrame) -> pd.DataFrame:
     return driver_scores
 
 
-def score_regions(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate efficiency scores by region."""
-    active = df[~df["is_cancelled"]]
+def score_regions(df: pd.DataFrame, active: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Aggregate efficiency scores by region.
     
-    region_scores = active.groupby("region").agg({
-        "efficiency_index": "mean",
-        "score_on_time": "mean",
-        "trip_id": "count",
-        "is_late_pickup": "mean",
-        "distance_miles": "mean",
-    }).reset_index()
+    Args:
+        df: Scored trip data
+        active: Non-cancelled subset of df, if already computed by the caller
+    """
+    if active is None:
+        active = df[~df["is_cancelled"]]
     
-    region_scores.columns = [
-        "region", "avg_efficiency", "avg_on_time_score",
-        "total_trips", "late_pickup_rate", "avg_distance"
-    ]
+    region_scores = active.groupby("region", observed=True, sort=False).agg(
+        avg_efficiency=("efficiency_index", "mean"),
+        avg_on_time_score=("score_on_time", "mean"),
+        total_trips=("trip_id", "count"),
+        late_pickup_rate=("is_late_pickup", "mean"),
+        avg_distance=("distance_miles", "mean"),
+    ).reset_index()
     
     region_scores = region_scores.sort_values("avg_efficiency", ascending=False)
     
@@ -170,24 +182,23 @@ def save_scored_data(
     print(f"Saved scored data to {PROCESSED_DIR}")
 
 
-def run_scoring_pipeline(input_file: str = "trips_features.csv") -> tuple:
+def run_scoring_pipeline(input_file: str = "trips_features.parquet") -> tuple:
     """Run full scoring pipeline."""
     filepath = PROCESSED_DIR / input_file
-    df = pd.read_csv(filepath, parse_dates=[
-        "requested_pickup_time",
-        "scheduled_pickup_time",
-        "actual_pickup_time",
-        "actual_dropoff_time",
-    ])
+    df = pd.read_parquet(filepath)
     
     print("Calculating efficiency index...")
     df_scored = calculate_efficiency_index(df)
     
+    # Filter cancelled trips once for both aggregations, keeping only the
+    # columns they read rather than slicing the full feature frame
+    active = df_scored.loc[~df_scored["is_cancelled"].to_numpy(dtype=bool), SCORE_AGG_COLUMNS]
+    
     print("Scoring drivers...")
-    drivers = score_drivers(df_scored)
+    drivers = score_drivers(df_scored, active)
     
     print("Scoring regions...")
-    regions = score_regions(df_scored)
+    regions = score_regions(df_scored, active)
     
     save_scored_data(df_scored, drivers, regions)
     
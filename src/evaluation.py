@@ -2,73 +2,112 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
-def calculate_summary_stats(df: pd.DataFrame) -> Dict:
-    """Calculate overall summary statistics."""
-    active = df[~df["is_cancelled"]]
+def _top_rows(perf: pd.DataFrame, column: str, n: int, largest: bool = False) -> pd.DataFrame:
+    """
+    Select the n rows with the smallest (or largest) values in column, sorted.
+    
+    Matches nsmallest/nlargest with keep="first": rows tied at the cutoff are
+    taken in their original order, and missing values only fill leftover slots.
+    """
+    values = perf[column].to_numpy(dtype=float)
+    if largest:
+        values = -values
+    missing = np.isnan(values)
+    valid = np.flatnonzero(~missing)
+    values = values[valid]
+    if n < len(values):
+        # Partial selection is O(len) and finds the cutoff; everything below
+        # it is in, then as many tied rows as still fit, first ones first
+        cutoff = np.partition(values, n - 1)[n - 1] if n > 0 else -np.inf
+        below = np.flatnonzero(values < cutoff)
+        tied = np.flatnonzero(values == cutoff)[:n - len(below)]
+        rows = valid[np.union1d(below, tied)]
+    else:
+        rows = np.concatenate([valid, np.flatnonzero(missing)[:n - len(values)]])
+    return perf.iloc[rows].sort_values(column, ascending=not largest, kind="stable")
+
+
+def _late_rate(active: pd.DataFrame) -> float:
+    """Share of late pickups, counted straight off the boolean flags."""
+    late = active["is_late_pickup"].to_numpy(dtype=bool)
+    return np.count_nonzero(late) / late.size if late.size else np.nan
+
+
+def calculate_summary_stats(df: pd.DataFrame, active: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Calculate overall summary statistics.
+    
+    Pass ``active`` (the non-cancelled subset of df) to reuse a filter the
+    caller has already applied.
+    """
+    if active is None:
+        active = df[~df["is_cancelled"]]
+    
+    # Pull each column once and reduce with numpy (NaN-skipping like pandas)
+    efficiency = active["efficiency_index"].to_numpy(dtype=float)
+    distance = active["distance_miles"].to_numpy(dtype=float)
+    duration = active["trip_duration_minutes"].to_numpy(dtype=float)
     
     return {
         "total_trips": len(df),
         "completed_trips": len(active),
         "cancelled_trips": len(df) - len(active),
         "cancellation_rate": (len(df) - len(active)) / len(df) * 100,
-        "on_time_rate": (1 - active["is_late_pickup"].mean()) * 100,
-        "avg_efficiency_index": active["efficiency_index"].mean(),
-        "avg_distance_miles": active["distance_miles"].mean(),
-        "avg_trip_duration": active["trip_duration_minutes"].mean(),
-        "total_miles": active["distance_miles"].sum(),
+        "on_time_rate": (1 - _late_rate(active)) * 100,
+        "avg_efficiency_index": np.nanmean(efficiency),
+        "avg_distance_miles": np.nanmean(distance),
+        "avg_trip_duration": np.nanmean(duration),
+        "total_miles": np.nansum(distance),
         "unique_drivers": active["driver_id"].nunique(),
         "unique_regions": active["region"].nunique(),
     }
 
 
-def identify_bottlenecks(df: pd.DataFrame, top_n: int = 10) -> Dict:
-    """Identify operational bottlenecks."""
-    active = df[~df["is_cancelled"]]
+def identify_bottlenecks(df: pd.DataFrame, top_n: int = 10, active: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Identify operational bottlenecks.
+    
+    Pass ``active`` (the non-cancelled subset of df) to reuse a filter the
+    caller has already applied.
+    """
+    if active is None:
+        active = df[~df["is_cancelled"]]
     
     # Worst performing drivers
-    driver_perf = active.groupby("driver_id").agg({
-        "efficiency_index": "mean",
-        "is_late_pickup": "mean",
-        "trip_id": "count",
-    }).reset_index()
+    driver_perf = active.groupby("driver_id", observed=True)[
+        ["efficiency_index", "is_late_pickup"]
+    ].mean().reset_index()
     
-    driver = driver_perf.nsmallest(top_n, "efficiency_index")[
+    driver = _top_rows(driver_perf, "efficiency_index", top_n)[
         ["driver_id", "efficiency_index", "is_late_pickup"]
     ]
     
     # Worst hours
-    hourly_perf = active.groupby("scheduled_hour").agg({
-        "is_late_pickup": "mean",
-        "trip_id": "count",
-    }).reset_index()
+    hourly_perf = active.groupby("scheduled_hour", observed=True)["is_late_pickup"].mean().reset_index()
     
-    hour = hourly_perf.nlargest(3, "is_late_pickup")[
+    hour = _top_rows(hourly_perf, "is_late_pickup", 3, largest=True)[
         ["scheduled_hour", "is_late_pickup"]
     ]
     
     # Worst regions
-    region_perf = active.groupby("region").agg({
-        "efficiency_index": "mean",
-        "is_late_pickup": "mean",
-    }).reset_index()
+    region_perf = active.groupby("region", observed=True)[
+        ["efficiency_index", "is_late_pickup"]
+    ].mean().reset_index()
     
     # Add late_pickup_rate for notebook compatibility
     region_perf = region_perf.rename(columns={"is_late_pickup": "late_pickup_rate"})
     
-    region = region_perf.nsmallest(3, "efficiency_index")[
+    region = _top_rows(region_perf, "efficiency_index", 3)[
         ["region", "efficiency_index", "late_pickup_rate"]
     ]
     
     # Worst trip types
-    trip_type_perf = active.groupby("trip_type").agg({
-        "is_late_pickup": "mean",
-        "trip_id": "count",
-    }).reset_index()
+    trip_type_perf = active.groupby("trip_type", observed=True)["is_late_pickup"].mean().reset_index()
     
-    trip_type = trip_type_perf.nlargest(3, "is_late_pickup")[
+    trip_type = _top_rows(trip_type_perf, "is_late_pickup", 3, largest=True)[
         ["trip_type", "is_late_pickup"]
     ]
     
@@ -80,11 +119,17 @@ def identify_bottlenecks(df: pd.DataFrame, top_n: int = 10) -> Dict:
     }
 
 
-def calculate_improvement_potential(df: pd.DataFrame) -> Dict:
-    """Estimate potential improvements from optimization."""
-    active = df[~df["is_cancelled"]]
+def calculate_improvement_potential(df: pd.DataFrame, active: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Estimate potential improvements from optimization.
+    
+    Pass ``active`` (the non-cancelled subset of df) to reuse a filter the
+    caller has already applied.
+    """
+    if active is None:
+        active = df[~df["is_cancelled"]]
     
-    current_on_time = 1 - active["is_late_pickup"].mean()
+    current_on_time = 1 - _late_rate(active)
     current_efficiency = active["efficiency_index"].mean()
     
     # Target: bring low performers up to median
@@ -124,9 +169,10 @@ def generate_evaluation_report(df: pd.DataFrame) -> str:
     """Generate a text-based evaluation report."""
     from .config import PROCESSED_DIR
     
-    stats = calculate_summary_stats(df)
-    bottlenecks = identify_bottlenecks(df)
-    improvements = calculate_improvement_potential(df)
+    active = df[~df["is_cancelled"]]
+    stats = calculate_summary_stats(df, active=active)
+    bottlenecks = identify_bottlenecks(df, active=active)
+    improvements = calculate_improvement_potential(df, active=active)
     
     report = []
     report.append("=" * 60)
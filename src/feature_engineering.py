@@ -7,22 +7,19 @@ from typing import Optional
 from .config import INTERIM_DIR, PROCESSED_DIR
 
 
-def load_cleaned_trips(filename: str = "trips_cleaned.csv") -> pd.DataFrame:
+def load_cleaned_trips(filename: str = "trips_cleaned.parquet") -> pd.DataFrame:
     """Load cleaned trip data."""
     filepath = INTERIM_DIR / filename
-    df = pd.read_csv(filepath, parse_dates=[
-        "requested_pickup_time",
-        "scheduled_pickup_time",
-        "actual_pickup_time",
-        "actual_dropoff_time",
-    ])
-    return df
+    return pd.read_parquet(filepath)
 
 
 def add_trip_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Add trip-level features."""
-    df = df.copy()
+    """
+    Add trip-level features.
     
+    Columns are added to df in place (and df is returned); pass a copy if
+    the caller still needs the original frame.
+    """
     # Speed estimate (actual)
     df["avg_speed_mph"] = np.where(
         df["trip_duration_minutes"] > 0,
@@ -38,72 +35,69 @@ def add_trip_features(df: pd.DataFrame) -> pd.DataFrame:
     df["estimated_driven_miles"] = df["distance_miles_calc"] * 1.3
     
     # Time of day categories
-    df["time_of_day"] = pd.cut(
-        df["scheduled_hour"],
-        bins=[0, 6, 12, 17, 21, 24],
-        labels=["early_morning", "morning", "afternoon", "evening", "night"],
-        include_lowest=True
+    # Right-closed hour bins (0-6], (6-12], ... as with pd.cut, via one searchsorted
+    time_of_day_edges = np.array([6, 12, 17, 21, 24])
+    df["time_of_day"] = pd.Categorical.from_codes(
+        np.searchsorted(time_of_day_edges, df["scheduled_hour"].to_numpy()),
+        categories=["early_morning", "morning", "afternoon", "evening", "night"],
+        ordered=True
     )
     
     return df
 
 
-def add_driver_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Add driver-level aggregated features."""
-    df = df.copy()
-    
-    # Non-cancelled trips only for driver stats
-    active_trips = df[~df["is_cancelled"]]
-    
-    # Driver daily stats
-    driver_daily = active_trips.groupby(["driver_id", "scheduled_date"]).agg({
-        "trip_id": "count",
-        "distance_miles": "sum",
-        "trip_duration_minutes": "sum",
-        "is_late_pickup": "mean",
-        "capacity_utilization": "mean",
-    }).reset_index()
-    
-    driver_daily.columns = [
-        "driver_id", "scheduled_date", 
-        "daily_trips", "daily_miles", "daily_minutes",
-        "daily_late_rate", "daily_capacity_util"
-    ]
-    
-    # Merge back
-    df = df.merge(
-        driver_daily,
-        on=["driver_id", "scheduled_date"],
-        how="left"
+def add_driver_features(df: pd.DataFrame, active_mask: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Add driver-level aggregated features.
+    
+    active_mask is the boolean non-cancelled mask over df's rows; it is
+    computed here when not supplied.
+    """
+    # Non-cancelled trips only for driver stats, reading just the needed columns
+    if active_mask is None:
+        active_mask = ~df["is_cancelled"].to_numpy(dtype=bool)
+    active_trips = df.loc[active_mask, [
+        "driver_id", "scheduled_date", "trip_id", "distance_miles",
+        "trip_duration_minutes", "is_late_pickup", "capacity_utilization",
+    ]]
+    
+    # Driver daily stats, indexed by (driver_id, scheduled_date)
+    driver_daily = active_trips.groupby(["driver_id", "scheduled_date"], observed=True).agg(
+        daily_trips=("trip_id", "count"),
+        daily_miles=("distance_miles", "sum"),
+        daily_minutes=("trip_duration_minutes", "sum"),
+        daily_late_rate=("is_late_pickup", "mean"),
+        daily_capacity_util=("capacity_utilization", "mean"),
     )
     
+    # Join back on the group index
+    df = df.join(driver_daily, on=["driver_id", "scheduled_date"])
+    
     return df
 
 
-def add_region_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Add region-level aggregated features."""
-    df = df.copy()
+def add_region_features(df: pd.DataFrame, active_mask: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Add region-level aggregated features.
     
+    active_mask is the boolean non-cancelled mask over df's rows; it is
+    computed here when not supplied.
+    """
     # Region daily stats
-    active_trips = df[~df["is_cancelled"]]
-    
-    region_daily = active_trips.groupby(["region", "scheduled_date"]).agg({
-        "trip_id": "count",
-        "is_late_pickup": "mean",
-        "avg_speed_mph": "mean",
-    }).reset_index()
-    
-    region_daily.columns = [
-        "region", "scheduled_date",
-        "region_daily_trips", "region_late_rate", "region_avg_speed"
-    ]
-    
-    df = df.merge(
-        region_daily,
-        on=["region", "scheduled_date"],
-        how="left"
+    if active_mask is None:
+        active_mask = ~df["is_cancelled"].to_numpy(dtype=bool)
+    active_trips = df.loc[active_mask, [
+        "region", "scheduled_date", "trip_id", "is_late_pickup", "avg_speed_mph",
+    ]]
+    
+    region_daily = active_trips.groupby(["region", "scheduled_date"], observed=True).agg(
+        region_daily_trips=("trip_id", "count"),
+        region_late_rate=("is_late_pickup", "mean"),
+        region_avg_speed=("avg_speed_mph", "mean"),
     )
     
+    df = df.join(region_daily, on=["region", "scheduled_date"])
+    
     return df
 
 
@@ -112,26 +106,29 @@ def create_feature_set(df: pd.DataFrame) -> pd.DataFrame:
     print("Adding trip features...")
     df = add_trip_features(df)
     
+    # Left joins keep row order, so one mask serves both aggregations
+    active_mask = ~df["is_cancelled"].to_numpy(dtype=bool)
+    
     print("Adding driver features...")
-    df = add_driver_features(df)
+    df = add_driver_features(df, active_mask)
     
     print("Adding region features...")
-    df = add_region_features(df)
+    df = add_region_features(df, active_mask)
     
     return df
 
 
-def save_features(df: pd.DataFrame, filename: str = "trips_features.csv") -> None:
+def save_features(df: pd.DataFrame, filename: str = "trips_features.parquet") -> None:
     """Save feature-engineered data."""
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
     filepath = PROCESSED_DIR / filename
-    df.to_csv(filepath, index=False)
+    df.to_parquet(filepath, index=False, compression="zstd")
     print(f"Saved {len(df)} trips with features to {filepath}")
 
 
 def run_feature_pipeline(
-    input_file: str = "trips_cleaned.csv",
-    output_file: str = "trips_features.csv"
+    input_file: str = "trips_cleaned.parquet",
+    output_file: str = "trips_features.parquet"
 ) -> pd.DataFrame:
     """Run full feature engineering pipeline."""
     df = load_cleaned_trips(input_file)
@@ -1,18 +1,21 @@
 """Routing simulation engine for NEMT optimization."""
 
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Union
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 
 from .config import PROCESSED_DIR, RANDOM_SEED
 from .utils import haversine_distance, set_seed
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SimulationResult:
-    """Results from a routing simulation run."""
+    """Results from a routing simulation run (immutable, no per-instance __dict__)."""
     strategy_name: str
     total_trips: int
     on_time_rate: float
@@ -33,6 +36,81 @@ class SimulationResult:
         }
 
 
+NS_PER_MINUTE = 60_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+NS_PER_DAY = 24 * NS_PER_HOUR
+NEVER_BUSY_NS = np.iinfo(np.int64).min  # stands in for datetime.min
+
+# Nearest-driver lookups go through a KD-tree once the fleet is this large;
+# below it a brute-force haversine over the available drivers is as cheap or
+# cheaper (measured crossovers fell between 3k and 10k drivers).
+KDTREE_MIN_DRIVERS = 8_000
+KDTREE_REBUILD_EVERY = 128  # assignments between rebuilds of the tree
+
+# The three assignment strategies run in worker processes from this many
+# trips on (given more than one core); smaller runs finish before the saving
+# would cover the cost of starting the pool and pickling the trips
+PARALLEL_MIN_TRIPS = 10_000
+
+
+@dataclass
+class DriverIndex:
+    """
+    Driver positions in radians with cos(latitude) cached, in driver-list order.
+    
+    Built once from a driver_locations dict so the nearest-driver search
+    does no driver-side degree conversion or cosine per trip; assign_nearest
+    updates it in place as drivers move.
+    """
+    lat_rad: np.ndarray
+    lng_rad: np.ndarray
+    cos_lat: np.ndarray
+    
+    @classmethod
+    def from_locations(cls, drivers: List[str], driver_locations: Dict) -> "DriverIndex":
+        lat_rad = np.radians(np.array([driver_locations[d][0] for d in drivers], dtype=float))
+        lng_rad = np.radians(np.array([driver_locations[d][1] for d in drivers], dtype=float))
+        return cls(lat_rad=lat_rad, lng_rad=lng_rad, cos_lat=np.cos(lat_rad))
+    
+    def move(self, driver_pos: int, lat_rad: float, lng_rad: float, cos_lat: float) -> None:
+        self.lat_rad[driver_pos] = lat_rad
+        self.lng_rad[driver_pos] = lng_rad
+        self.cos_lat[driver_pos] = cos_lat
+
+
+def _schedule_arrays(trips: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scheduled pickups as int64 nanoseconds, plus how long each trip keeps
+    its driver busy (trip duration, or 30 min if unknown, plus a 10 min buffer).
+    """
+    sched_ns = trips["scheduled_pickup_time"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    trip_duration = trips["trip_duration_minutes"].to_numpy(dtype=float)
+    trip_duration = np.where(np.isnan(trip_duration), 30, trip_duration)
+    # Whole microseconds, as timedelta(minutes=...) would round
+    busy_ns = np.round((trip_duration + 10) * 60_000_000).astype(np.int64) * 1000
+    return sched_ns, busy_ns
+
+
+def _assignment_frame(
+    trips: pd.DataFrame,
+    drivers: List[str],
+    assigned: np.ndarray,
+    strategy: str
+) -> pd.DataFrame:
+    """
+    Build a strategy's assignment frame from driver positions.
+    
+    The positions become the codes of a Categorical over the driver list,
+    so no per-row driver string is materialised and later grouping or
+    matching by driver works on the integer codes.
+    """
+    return pd.DataFrame({
+        "trip_id": trips["trip_id"].to_numpy(),
+        "assigned_driver": pd.Categorical.from_codes(assigned, categories=drivers),
+        "strategy": strategy,
+    })
+
+
 def assign_fcfs(trips: pd.DataFrame, drivers: List[str]) -> pd.DataFrame:
     """
     First-Come-First-Served assignment strategy.
@@ -40,83 +118,197 @@ def assign_fcfs(trips: pd.DataFrame, drivers: List[str]) -> pd.DataFrame:
     Assigns trips to drivers in order of request time,
     using the next available driver.
     """
-    trips = trips.sort_values("requested_pickup_time").copy()
-    driver_available_at = {d: datetime.min for d in drivers}
+    if not trips["requested_pickup_time"].is_monotonic_increasing:
+        trips = trips.sort_values("requested_pickup_time")
+    sched_ns, busy_ns = _schedule_arrays(trips)
+    sched_ns = sched_ns.tolist()
+    finish_ns = (np.asarray(sched_ns) + busy_ns).tolist()
+    driver_available_at = [NEVER_BUSY_NS] * len(drivers)
     
-    assignments = []
+    # Busy drivers in a (available_at, position) heap; drivers that have come
+    # free wait in a position heap so the first driver in list order wins.
+    # Trips arrive by request time, so scheduled times can step backwards:
+    # a "free" driver is re-checked when popped and re-queued if still busy.
+    busy_heap: List[Tuple[int, int]] = []
+    free_heap = list(range(len(drivers)))
+    assigned = np.empty(len(trips), dtype=np.intp)
     
-    for _, trip in trips.iterrows():
+    for i in range(len(trips)):
+        while busy_heap and busy_heap[0][0] <= sched_ns[i]:
+            heapq.heappush(free_heap, heapq.heappop(busy_heap)[1])
+        
         # Find first available driver
-        available_drivers = [
-            d for d, t in driver_available_at.items()
-            if t <= trip["scheduled_pickup_time"]
-        ]
+        driver_pos = None
+        while free_heap:
+            candidate = heapq.heappop(free_heap)
+            if driver_available_at[candidate] <= sched_ns[i]:
+                driver_pos = candidate
+                break
+            heapq.heappush(busy_heap, (driver_available_at[candidate], candidate))
         
-        if not available_drivers:
+        if driver_pos is None:
             # All busy, pick one that becomes free soonest
-            assigned_driver = min(driver_available_at, key=driver_available_at.get)
-        else:
-            assigned_driver = available_drivers[0]
-        
-        # Estimate when driver will be free after this trip
-        trip_duration = trip["trip_duration_minutes"] if pd.notna(trip["trip_duration_minutes"]) else 30
-        finish_time = trip["scheduled_pickup_time"] + timedelta(minutes=trip_duration + 10)
-        driver_available_at[assigned_driver] = finish_time
+            driver_pos = heapq.heappop(busy_heap)[1]
         
-        assignments.append({
-            "trip_id": trip["trip_id"],
-            "assigned_driver": assigned_driver,
-            "strategy": "FCFS",
-        })
+        # Driver is busy until this trip (plus buffer) ends
+        driver_available_at[driver_pos] = finish_ns[i]
+        heapq.heappush(busy_heap, (finish_ns[i], driver_pos))
+        assigned[i] = driver_pos
+    
+    return _assignment_frame(trips, drivers, assigned, "FCFS")
+
+
+def _release_drivers(
+    busy_heap: List[Tuple[int, int]],
+    available: np.ndarray,
+    driver_available_at: np.ndarray,
+    now: int
+) -> None:
+    """
+    Mark drivers whose busy period has ended by ``now`` as available.
+    
+    ``busy_heap`` holds (available_at, position) events; an entry is stale
+    once its driver has been reassigned, so only current ones free a driver.
+    """
+    while busy_heap and busy_heap[0][0] <= now:
+        free_at, driver_pos = heapq.heappop(busy_heap)
+        if driver_available_at[driver_pos] == free_at:
+            available[driver_pos] = True
+
+
+def _unit_xyz(lat_rad: np.ndarray, lng_rad: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere; chord length orders pairs as great-circle distance does."""
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack([cos_lat * np.cos(lng_rad), cos_lat * np.sin(lng_rad), np.sin(lat_rad)])
+
+
+def _tree_candidates(
+    tree,
+    point_xyz: np.ndarray,
+    available: np.ndarray,
+    moved: np.ndarray
+) -> np.ndarray:
+    """
+    Drivers that can be nearest to a pickup: the closest available drivers
+    still at their indexed position, plus every available driver that has
+    moved since the tree was built (their indexed position is stale).
+    """
+    n_drivers = len(available)
+    k = min(8, n_drivers)
+    while True:
+        dist, idx = tree.query(point_xyz, k=list(range(1, k + 1)))
+        fresh = available[idx] & ~moved[idx]
+        if k == n_drivers:
+            break
+        # Widen the query until a usable driver shows up and every driver
+        # tied with it is inside the result
+        if fresh.any() and dist[-1] > dist[fresh][0] + 1e-12:
+            break
+        k = min(2 * k, n_drivers)
     
-    return pd.DataFrame(assignments)
+    if fresh.any():
+        best = dist[fresh][0]
+        nearest_fresh = idx[fresh & (dist <= best + 1e-12)]
+    else:
+        nearest_fresh = idx[:0]
+    stale = np.flatnonzero(available & moved)
+    return np.union1d(nearest_fresh, stale)
 
 
-def assign_nearest(trips: pd.DataFrame, drivers: List[str], driver_locations: Dict) -> pd.DataFrame:
+def assign_nearest(
+    trips: pd.DataFrame,
+    drivers: List[str],
+    driver_locations: Union[Dict, DriverIndex]
+) -> pd.DataFrame:
     """
     Nearest-driver assignment strategy.
     
-    Assigns each trip to the closest available driver.
+    Assigns each trip to the closest available driver. driver_locations is
+    either a dict of (lat, lng) by driver ID or a prebuilt DriverIndex;
+    whichever is given ends up holding each driver's final location.
     """
-    trips = trips.sort_values("scheduled_pickup_time").copy()
-    driver_available_at = {d: datetime.min for d in drivers}
+    if not trips["scheduled_pickup_time"].is_monotonic_increasing:
+        trips = trips.sort_values("scheduled_pickup_time")
+    sched_ns, busy_ns = _schedule_arrays(trips)
+    pickup_lat = trips["pickup_lat"].to_numpy()
+    pickup_lng = trips["pickup_lng"].to_numpy()
+    dropoff_lat = trips["dropoff_lat"].to_numpy()
+    dropoff_lng = trips["dropoff_lng"].to_numpy()
+    driver_available_at = np.full(len(drivers), NEVER_BUSY_NS, dtype=np.int64)
     
-    assignments = []
+    # Sweep trips in scheduled order against a heap of driver free-up events,
+    # so the available set is updated as drivers free up, not rescanned
+    available = np.ones(len(drivers), dtype=bool)
+    everyone = np.ones(len(drivers), dtype=bool)
+    busy_heap: List[Tuple[int, int]] = []
     
-    for _, trip in trips.iterrows():
+    # Driver positions change only when a driver is assigned, so the index
+    # carries their radians and cos(latitude) across trips. Pickup and
+    # dropoff terms are precomputed for every trip.
+    if isinstance(driver_locations, DriverIndex):
+        index = driver_locations
+    else:
+        index = DriverIndex.from_locations(drivers, driver_locations)
+    driver_lat, driver_lng, driver_cos_lat = index.lat_rad, index.lng_rad, index.cos_lat
+    pickup_lat_rad, pickup_lng_rad = np.radians(pickup_lat), np.radians(pickup_lng)
+    pickup_cos_lat = np.cos(pickup_lat_rad)
+    dropoff_lat_rad = np.radians(dropoff_lat.astype(float))
+    dropoff_lng_rad = np.radians(dropoff_lng.astype(float))
+    dropoff_cos_lat = np.cos(dropoff_lat_rad)
+    
+    # Large fleets: index driver positions in a KD-tree over unit-sphere
+    # points, rebuilt in batches as drivers move; moved drivers are checked
+    # directly until the rebuild
+    use_tree = len(drivers) >= KDTREE_MIN_DRIVERS
+    if use_tree:
+        from scipy.spatial import cKDTree
+        pickup_xyz = _unit_xyz(pickup_lat_rad.astype(float), pickup_lng_rad.astype(float))
+        moved = np.zeros(len(drivers), dtype=bool)
+    
+    assigned = np.empty(len(trips), dtype=np.intp)
+    
+    for i in range(len(trips)):
         # Find available drivers
-        available_drivers = [
-            d for d, t in driver_available_at.items()
-            if t <= trip["scheduled_pickup_time"]
-        ]
+        _release_drivers(busy_heap, available, driver_available_at, sched_ns[i])
+        candidates = available if available.any() else everyone  # All busy, consider all
         
-        if not available_drivers:
-            available_drivers = drivers  # All busy, consider all
+        if use_tree:
+            if i % KDTREE_REBUILD_EVERY == 0:
+                tree = cKDTree(_unit_xyz(driver_lat, driver_lng))
+                moved[:] = False
+            available_idx = _tree_candidates(tree, pickup_xyz[i], candidates, moved)
+        else:
+            available_idx = np.flatnonzero(candidates)
         
-        # Find nearest driver
-        pickup_loc = (trip["pickup_lat"], trip["pickup_lng"])
-        distances = {
-            d: haversine_distance(
-                driver_locations[d][0], driver_locations[d][1],
-                pickup_loc[0], pickup_loc[1]
-            )
-            for d in available_drivers
-        }
-        assigned_driver = min(distances, key=distances.get)
+        # Find nearest driver (argmin keeps the first of equal distances). The
+        # haversine term grows with distance, so ranking by it skips the
+        # sqrt/arcsin that would turn each candidate's value into miles
+        dlat = pickup_lat_rad[i] - driver_lat[available_idx]
+        dlng = pickup_lng_rad[i] - driver_lng[available_idx]
+        a = np.sin(dlat / 2) ** 2 + driver_cos_lat[available_idx] * pickup_cos_lat[i] * np.sin(dlng / 2) ** 2
+        driver_pos = available_idx[np.argmin(a)]
         
         # Update driver location and availability
-        driver_locations[assigned_driver] = (trip["dropoff_lat"], trip["dropoff_lng"])
-        trip_duration = trip["trip_duration_minutes"] if pd.notna(trip["trip_duration_minutes"]) else 30
-        finish_time = trip["scheduled_pickup_time"] + timedelta(minutes=trip_duration + 10)
-        driver_available_at[assigned_driver] = finish_time
-        
-        assignments.append({
-            "trip_id": trip["trip_id"],
-            "assigned_driver": assigned_driver,
-            "strategy": "Nearest",
-        })
+        index.move(driver_pos, dropoff_lat_rad[i], dropoff_lng_rad[i], dropoff_cos_lat[i])
+        driver_available_at[driver_pos] = sched_ns[i] + busy_ns[i]
+        available[driver_pos] = False
+        heapq.heappush(busy_heap, (sched_ns[i] + busy_ns[i], driver_pos))
+        if use_tree:
+            moved[driver_pos] = True
+        assigned[i] = driver_pos
+    
+    if driver_locations is index:
+        return _assignment_frame(trips, drivers, assigned, "Nearest")
+    
+    # Report final locations back by driver ID: each driver ends at the
+    # dropoff of their last trip
+    last_trip = np.full(len(drivers), -1)
+    np.maximum.at(last_trip, assigned, np.arange(len(assigned)))
+    for driver_pos in np.flatnonzero(last_trip >= 0):
+        i = last_trip[driver_pos]
+        driver_locations[drivers[driver_pos]] = (dropoff_lat[i], dropoff_lng[i])
     
-    return pd.DataFrame(assignments)
+    return _assignment_frame(trips, drivers, assigned, "Nearest")
 
 
 def assign_capacity_aware(
@@ -129,43 +321,255 @@ def assign_capacity_aware(
     
     Prioritizes matching vehicle capacity to passenger count.
     """
-    trips = trips.sort_values("scheduled_pickup_time").copy()
-    driver_available_at = {d: datetime.min for d in drivers}
+    if not trips["scheduled_pickup_time"].is_monotonic_increasing:
+        trips = trips.sort_values("scheduled_pickup_time")
+    sched_ns, busy_ns = _schedule_arrays(trips)
+    num_passengers = trips["num_passengers"].to_numpy()
+    capacity = np.array([driver_capacities[d] for d in drivers])
+    driver_available_at = np.full(len(drivers), NEVER_BUSY_NS, dtype=np.int64)
     
-    assignments = []
+    # Score by capacity match (prefer smallest vehicle that fits): penalty
+    # for too small, otherwise the excess. Scores depend only on the
+    # passenger count, so there is one row per distinct count.
+    pax_values, pax_row = np.unique(num_passengers, return_inverse=True)
+    pax_values = pax_values[:, None]
+    # Float scores, whatever the input dtypes, so busy drivers mask as inf
+    score_table = np.where(capacity < pax_values, 1000, capacity - pax_values).astype(float)
     
-    for _, trip in trips.iterrows():
-        passengers = trip["num_passengers"]
-        
+    # Sweep trips in scheduled order against driver free-up events
+    available = np.ones(len(drivers), dtype=bool)
+    busy_heap: List[Tuple[int, int]] = []
+    
+    assigned = np.empty(len(trips), dtype=np.intp)
+    
+    for i in range(len(trips)):
         # Find available drivers
-        available_drivers = [
-            d for d, t in driver_available_at.items()
-            if t <= trip["scheduled_pickup_time"]
-        ]
+        _release_drivers(busy_heap, available, driver_available_at, sched_ns[i])
         
-        if not available_drivers:
-            available_drivers = drivers
+        # Mask busy drivers out of the trip's score row (all busy: consider
+        # all); argmin keeps the first of equal scores
+        scores = score_table[pax_row[i]]
+        if available.any():
+            scores = np.where(available, scores, np.inf)
+        driver_pos = int(np.argmin(scores))
         
-        # Score by capacity match (prefer smallest vehicle that fits)
-        def capacity_score(driver):
-            cap = driver_capacities[driver]
-            if cap < passengers:
-                return 1000  # Penalty for too small
-            return cap - passengers  # Prefer minimal excess
+        driver_available_at[driver_pos] = sched_ns[i] + busy_ns[i]
+        available[driver_pos] = False
+        heapq.heappush(busy_heap, (sched_ns[i] + busy_ns[i], driver_pos))
+        assigned[i] = driver_pos
+    
+    return _assignment_frame(trips, drivers, assigned, "Capacity-Aware")
+
+
+def assignments_by_trip(assignments: pd.DataFrame) -> Dict[str, str]:
+    """Map trip ID to assigned driver, for O(1) lookups into an assignment frame."""
+    return dict(zip(assignments["trip_id"].tolist(), assignments["assigned_driver"].tolist()))
+
+
+def _simulate_core(
+    pickup_lat: np.ndarray,
+    pickup_lng: np.ndarray,
+    dropoff_lat: np.ndarray,
+    dropoff_lng: np.ndarray,
+    distance_miles: np.ndarray,
+    sched_ns: np.ndarray,
+    day_start_ns: np.ndarray,
+    shift_start_ns: np.ndarray,
+    trip_duration: np.ndarray,
+    num_passengers: np.ndarray,
+    driver_idx: np.ndarray,
+    trip_rank: np.ndarray,
+    noise: np.ndarray | None,
+    initial_lat: np.ndarray,
+    initial_lng: np.ndarray,
+    driver_capacity: np.ndarray,
+    avg_speed_mph: float
+) -> List[Tuple[List[float], ...]]:
+    """
+    Drive every strategy's fleet through the trips in one scheduled-order sweep.
+    
+    Trip arrays are in scheduled order, with times as int64 nanoseconds and
+    each trip's midnight and earliest shift start precomputed. Row ``s`` of
+    ``driver_idx`` holds strategy ``s``'s driver per trip (-1 if none), and
+    ``trip_rank`` the trip's position in that strategy's driver-by-driver
+    order, which indexes the shared ``noise`` draws and the outputs. Returns, per
+    strategy, per-trip miles, idle minutes, trip minutes, delays and
+    utilizations.
+    """
+    n_strategies, n_trips = driver_idx.shape
+    
+    # Python scalars index faster than numpy ones in a plain loop
+    pickup_lat, pickup_lng = pickup_lat.tolist(), pickup_lng.tolist()
+    dropoff_lat, dropoff_lng = dropoff_lat.tolist(), dropoff_lng.tolist()
+    distance_miles, sched_ns = distance_miles.tolist(), sched_ns.tolist()
+    day_start_ns, shift_start_ns = day_start_ns.tolist(), shift_start_ns.tolist()
+    trip_duration, num_passengers = trip_duration.tolist(), num_passengers.tolist()
+    driver_idx, trip_rank = driver_idx.tolist(), trip_rank.tolist()
+    if noise is not None:
+        noise = noise.tolist()
+    capacity = driver_capacity.tolist()
+    
+    # Per-strategy driver state; a driver's first trip starts a fresh shift
+    driver_time = [[NEVER_BUSY_NS] * len(capacity) for _ in range(n_strategies)]
+    driver_lat = [initial_lat.tolist() for _ in range(n_strategies)]
+    driver_lng = [initial_lng.tolist() for _ in range(n_strategies)]
+    outputs = [tuple([0.0] * n_trips for _ in range(5)) for _ in range(n_strategies)]
+    
+    for i in range(n_trips):
+        scheduled = sched_ns[i]
         
-        assigned_driver = min(available_drivers, key=capacity_score)
+        for s in range(n_strategies):
+            d = driver_idx[s][i]
+            if d < 0:
+                continue
+            k = trip_rank[s][i]
+            current_time = driver_time[s][d]
+            
+            # Reset driver start time at day boundaries so overnight gaps
+            # are not counted as in-shift idle time.
+            if current_time < day_start_ns[i]:
+                current_time = shift_start_ns[i]
+            
+            # 1. Deadhead travel
+            deadhead_miles = haversine_distance(driver_lat[s][d], driver_lng[s][d], pickup_lat[i], pickup_lng[i])
+            deadhead_time_mins = (deadhead_miles / avg_speed_mph) * 60
+            
+            if noise is not None:
+                deadhead_time_mins *= noise[k][0]
+            
+            # Whole microseconds, as timedelta(minutes=...) would round
+            arrival_at_pickup = current_time + round(deadhead_time_mins * 60_000_000) * 1000
+            
+            # 2. Pickup timing
+            # Driver can't pick up before scheduled time unless they arrived early
+            # but if they arrive early, they wait (idle)
+            actual_pickup_time = max(arrival_at_pickup, scheduled)
+            
+            # 3. Trip execution
+            duration = trip_duration[i]
+            if noise is not None:
+                duration *= noise[k][1]
+            
+            # 4. Record metrics
+            leg_miles, idle, durations, delays, utilizations = outputs[s]
+            leg_miles[k] = deadhead_miles + distance_miles[i]
+            idle[k] = (actual_pickup_time - arrival_at_pickup) / 1e9 / 60
+            durations[k] = duration
+            delays[k] = (actual_pickup_time - scheduled) / 1e9 / 60
+            utilizations[k] = num_passengers[i] / capacity[d]
+            
+            # 5. Update state
+            driver_lat[s][d], driver_lng[s][d] = dropoff_lat[i], dropoff_lng[i]
+            driver_time[s][d] = actual_pickup_time + round(duration * 60_000_000) * 1000
+    
+    return outputs
+
+
+def simulate_strategies(
+    trips: pd.DataFrame,
+    assignments: List[pd.DataFrame],
+    initial_locations: Dict[str, Tuple[float, float]],
+    driver_capacities: Dict[str, int],
+    avg_speed_mph: float = 25.0,
+    add_noise: bool = True
+) -> List[SimulationResult]:
+    """
+    Simulate several strategies' assignments of the same trips together.
+    
+    Trips are filtered and laid out once and a single pass in scheduled
+    order drives every strategy's fleet; each result matches what
+    simulate_strategy returns for that assignment on its own.
+    """
+    active = trips[~trips["is_cancelled"]]
+    # One sweep in scheduled order; trips at the same time keep their order
+    all_sched_ns = active["scheduled_pickup_time"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    by_time = np.argsort(all_sched_ns, kind="stable")
+    active = active.iloc[by_time]
+    sched_ns = all_sched_ns[by_time]
+    
+    # Midnight of each trip's day, and the earliest a shift can start for it:
+    # 1 hour before pickup or 6 AM, whichever is later
+    day_start_ns = sched_ns - sched_ns % NS_PER_DAY
+    shift_start_ns = np.maximum(sched_ns - NS_PER_HOUR, day_start_ns + 6 * NS_PER_HOUR)
+    
+    # Index the active trips once; each strategy's assignment rows map onto
+    # it (rows for cancelled or unknown trips fall out as -1)
+    active_ids = pd.Index(active["trip_id"])
+    positions = [active_ids.get_indexer(a["trip_id"]) for a in assignments]
+    matched_drivers = [
+        a["assigned_driver"].array[pos >= 0] for a, pos in zip(assignments, positions)
+    ]
+    
+    # Only drivers with an active trip are simulated (and need a location
+    # and capacity)
+    drivers = sorted(set().union(*(pd.unique(d[~pd.isna(d)]) for d in matched_drivers)))
+    n_trips = len(active)
+    driver_idx = np.full((len(assignments), n_trips), -1, dtype=np.intp)
+    trip_rank = np.zeros((len(assignments), n_trips), dtype=np.intp)
+    trip_counts = []
+    
+    for s, (pos, strategy_drivers) in enumerate(zip(positions, matched_drivers)):
+        matched = pos >= 0
+        # A categorical column is recoded from its codes, not its strings
+        assigned = pd.Categorical(strategy_drivers, categories=drivers)
+        driver_idx[s, pos[matched]] = assigned.codes
+        trip_counts.append(int(matched.sum()))
         
-        trip_duration = trip["trip_duration_minutes"] if pd.notna(trip["trip_duration_minutes"]) else 30
-        finish_time = trip["scheduled_pickup_time"] + timedelta(minutes=trip_duration + 10)
-        driver_available_at[assigned_driver] = finish_time
+        # Each strategy runs driver by driver, each driver's day in order
+        driven = np.flatnonzero(driver_idx[s] >= 0)
+        order = driven[np.argsort(driver_idx[s, driven], kind="stable")]
+        trip_rank[s, order] = np.arange(len(order))
+    
+    # Every strategy replays the same seeded noise stream in its own order,
+    # a deadhead and a duration factor per trip, so one buffer serves all
+    set_seed(RANDOM_SEED)
+    noise = None
+    if add_noise:
+        n_draws = int(np.count_nonzero(driver_idx >= 0, axis=1).max(initial=0))
+        noise = np.random.normal(1.0, [0.1, 0.05], size=(n_draws, 2))
+    
+    outputs = _simulate_core(
+        pickup_lat=active["pickup_lat"].to_numpy(dtype=float),
+        pickup_lng=active["pickup_lng"].to_numpy(dtype=float),
+        dropoff_lat=active["dropoff_lat"].to_numpy(dtype=float),
+        dropoff_lng=active["dropoff_lng"].to_numpy(dtype=float),
+        distance_miles=active["distance_miles"].to_numpy(dtype=float),
+        sched_ns=sched_ns,
+        day_start_ns=day_start_ns,
+        shift_start_ns=shift_start_ns,
+        trip_duration=active["trip_duration_minutes"].to_numpy(dtype=float),
+        num_passengers=active["num_passengers"].to_numpy(),
+        driver_idx=driver_idx,
+        trip_rank=trip_rank,
+        noise=noise,
+        initial_lat=np.array([initial_locations[d][0] for d in drivers], dtype=float),
+        initial_lng=np.array([initial_locations[d][1] for d in drivers], dtype=float),
+        driver_capacity=np.array([driver_capacities[d] for d in drivers]),
+        avg_speed_mph=avg_speed_mph,
+    )
+    
+    results = []
+    for s, strategy_assignments in enumerate(assignments):
+        n_driven = int(np.count_nonzero(driver_idx[s] >= 0))
+        leg_miles, idle, durations, delays, utilizations = np.array(outputs[s])[:, :n_driven]
+        total_trips = trip_counts[s]
+        
+        # Aggregate Results
+        on_time_rate = np.count_nonzero(delays <= 10) / n_driven if n_driven else 0
+        avg_idle = float(idle.sum()) / total_trips if total_trips > 0 else 0
+        utilization = float(utilizations.mean()) if n_driven else 0
         
-        assignments.append({
-            "trip_id": trip["trip_id"],
-            "assigned_driver": assigned_driver,
-            "strategy": "Capacity-Aware",
-        })
+        results.append(SimulationResult(
+            strategy_name=strategy_assignments["strategy"].iloc[0],
+            total_trips=total_trips,
+            on_time_rate=on_time_rate,
+            total_miles=float(leg_miles.sum()),
+            avg_trip_duration=float(durations.sum()) / total_trips if total_trips > 0 else 0,
+            avg_idle_time=avg_idle,
+            utilization_rate=utilization,
+        ))
     
-    return pd.DataFrame(assignments)
+    return results
 
 
 def simulate_strategy(
@@ -184,114 +588,83 @@ def simulate_strategy(
     - Actual arrival times based on travel dynamics
     - Strategy-dependent delays and idle times
     """
-    set_seed(RANDOM_SEED)
-    
-    merged = trips.merge(assignments, on="trip_id")
-    active = merged[~merged["is_cancelled"]].copy()
-    
-    strategy_name = assignments["strategy"].iloc[0]
-
     # Backward-compatible defaults so the function can be called with only
     # (trips, assignments), as done in unit tests and simple notebook demos.
-    assigned_drivers = sorted(active["assigned_driver"].dropna().unique().tolist())
+    if initial_locations is None or driver_capacities is None:
+        merged = trips.merge(assignments, on="trip_id")
+        active = merged[~merged["is_cancelled"]]
+        assigned_drivers = sorted(active["assigned_driver"].dropna().unique().tolist())
 
     if initial_locations is None:
+        # Each driver starts at the pickup of their earliest trip
+        sched_ns = active["scheduled_pickup_time"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        pickup_lat = active["pickup_lat"].to_numpy()
+        pickup_lng = active["pickup_lng"].to_numpy()
         initial_locations = {}
-        for driver in assigned_drivers:
-            driver_rows = active[active["assigned_driver"] == driver]
-            if not driver_rows.empty:
-                first_row = driver_rows.sort_values("scheduled_pickup_time").iloc[0]
-                initial_locations[driver] = (first_row["pickup_lat"], first_row["pickup_lng"])
+        for driver, rows in active.groupby("assigned_driver").indices.items():
+            first = rows[np.argmin(sched_ns[rows])]
+            initial_locations[driver] = (pickup_lat[first], pickup_lng[first])
 
     if driver_capacities is None:
         inferred_capacity = 4
         if "vehicle_capacity" in active.columns:
-            valid_caps = active["vehicle_capacity"].dropna()
-            if not valid_caps.empty:
-                inferred_capacity = int(valid_caps.mode().iloc[0])
+            valid_caps = active["vehicle_capacity"].dropna().to_numpy()
+            if valid_caps.size:
+                # Most common capacity, smallest on ties (as Series.mode orders)
+                values, counts = np.unique(valid_caps, return_counts=True)
+                inferred_capacity = int(values[np.argmax(counts)])
         driver_capacities = {driver: inferred_capacity for driver in assigned_drivers}
     
-    total_miles = 0.0
-    total_idle_minutes = 0.0
-    all_delays = []
-    all_utilizations = []
-    total_duration = 0.0
+    return simulate_strategies(
+        trips, [assignments], initial_locations, driver_capacities, avg_speed_mph, add_noise
+    )[0]
+
+
+def simulate_all_strategies(
+    trips: pd.DataFrame,
+    drivers: List[str],
+    initial_locations: Dict[str, Tuple[float, float]],
+    driver_capacities: Dict[str, int]
+) -> Dict[str, SimulationResult]:
+    """
+    Assign trips with every routing strategy and simulate each assignment.
+    
+    The three assignments are independent, so large runs compute them in
+    worker processes; the simulations then share one pass over the trips.
+    Results are keyed by strategy name, in FCFS, Nearest, Capacity-Aware order.
+    """
+    # Sort once for each ordering the strategies use; they skip sorting ordered input
+    trips_by_request = trips.sort_values("requested_pickup_time")
+    trips_by_schedule = trips.sort_values("scheduled_pickup_time")
     
-    # Process each driver's day
-    for driver, driver_trips in active.groupby("assigned_driver"):
-        # Sort by scheduled pickup
-        driver_trips = driver_trips.sort_values("scheduled_pickup_time")
+    # Run each strategy
+    if len(trips) >= PARALLEL_MIN_TRIPS and (os.cpu_count() or 1) > 1:
+        # The assignments are independent, so large runs spread them over processes
+        print("Running FCFS, Nearest-Driver and Capacity-Aware strategies in parallel...")
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(assign_fcfs, trips_by_request, drivers),
+                pool.submit(assign_nearest, trips_by_schedule, drivers, initial_locations.copy()),
+                pool.submit(assign_capacity_aware, trips_by_schedule, drivers, driver_capacities),
+            ]
+            assignments = [future.result() for future in futures]
+    else:
+        print("Running FCFS strategy...")
+        fcfs_assignments = assign_fcfs(trips_by_request, drivers)
         
-        current_loc = initial_locations[driver]
-        # Start time is 1 hour before first trip or 6 AM (whichever is later)
-        first_trip_time = driver_trips["scheduled_pickup_time"].iloc[0]
-        current_time = max(first_trip_time - timedelta(hours=1), first_trip_time.replace(hour=6, minute=0, second=0, microsecond=0))
+        print("Running Nearest-Driver strategy...")
+        # nearest_assignments updates locations, so we pass a copy
+        nearest_assignments = assign_nearest(trips_by_schedule, drivers, initial_locations.copy())
         
-        driver_capacity = driver_capacities[driver]
+        print("Running Capacity-Aware strategy...")
+        capacity_assignments = assign_capacity_aware(trips_by_schedule, drivers, driver_capacities)
         
-        for _, trip in driver_trips.iterrows():
-            pickup_loc = (trip["pickup_lat"], trip["pickup_lng"])
-            dropoff_loc = (trip["dropoff_lat"], trip["dropoff_lng"])
-
-            # Reset driver start time at day boundaries so overnight gaps
-            # are not counted as in-shift idle time.
-            trip_date = trip["scheduled_pickup_time"].date()
-            if current_time.date() < trip_date:
-                # New day: reset to 1 hour before trip or 6 AM (whichever is later)
-                current_time = max(
-                    trip["scheduled_pickup_time"] - timedelta(hours=1),
-                    trip["scheduled_pickup_time"].replace(hour=6, minute=0, second=0, microsecond=0)
-                )
-
-            # 1. Deadhead travel
-            deadhead_miles = haversine_distance(current_loc[0], current_loc[1], pickup_loc[0], pickup_loc[1])
-            deadhead_time_mins = (deadhead_miles / avg_speed_mph) * 60
-            
-            if add_noise:
-                deadhead_time_mins *= np.random.normal(1.0, 0.1)
-            
-            arrival_at_pickup = current_time + timedelta(minutes=deadhead_time_mins)
-            
-            # 2. Pickup timing
-            # Driver can't pick up before scheduled time unless they arrived early
-            # but if they arrive early, they wait (idle)
-            actual_pickup_time = max(arrival_at_pickup, trip["scheduled_pickup_time"])
-            
-            idle_mins = (actual_pickup_time - arrival_at_pickup).total_seconds() / 60
-            delay_mins = (actual_pickup_time - trip["scheduled_pickup_time"]).total_seconds() / 60
-            
-            # 3. Trip execution
-            trip_duration = trip["trip_duration_minutes"]
-            if add_noise:
-                trip_duration *= np.random.normal(1.0, 0.05)
-            
-            actual_dropoff_time = actual_pickup_time + timedelta(minutes=trip_duration)
-            
-            # 4. Update metrics
-            total_miles += deadhead_miles + trip["distance_miles"]
-            total_idle_minutes += idle_mins
-            total_duration += trip_duration
-            all_delays.append(delay_mins)
-            all_utilizations.append(trip["num_passengers"] / driver_capacity)
-            
-            # 5. Update state
-            current_loc = dropoff_loc
-            current_time = actual_dropoff_time
-
-    # Aggregate Results
-    on_time_rate = np.mean([1 if d <= 10 else 0 for d in all_delays]) if all_delays else 0
-    avg_idle = total_idle_minutes / len(active) if len(active) > 0 else 0
-    utilization = np.mean(all_utilizations) if all_utilizations else 0
-    
-    return SimulationResult(
-        strategy_name=strategy_name,
-        total_trips=len(active),
-        on_time_rate=on_time_rate,
-        total_miles=total_miles,
-        avg_trip_duration=total_duration / len(active) if len(active) > 0 else 0,
-        avg_idle_time=avg_idle,
-        utilization_rate=utilization,
-    )
+        assignments = [fcfs_assignments, nearest_assignments, capacity_assignments]
+    
+    # Simulate all three together in one pass over the trips
+    results = simulate_strategies(trips, assignments, initial_locations, driver_capacities)
+    
+    return {result.strategy_name: result for result in results}
 
 
 def run_simulation_comparison(
@@ -305,11 +678,13 @@ def run_simulation_comparison(
     # Seed for reproducibility
     set_seed(seed)
     
-    # Ensure time columns are datetimes
-    trips = trips.copy()
-    for col in ["requested_pickup_time", "scheduled_pickup_time", "actual_pickup_time", "actual_dropoff_time"]:
-        if col in trips.columns:
-            trips[col] = pd.to_datetime(trips[col])
+    # Ensure the time columns the strategies read are nanosecond datetimes,
+    # so each int64 view taken downstream is zero-copy
+    trips = trips.assign(**{
+        col: pd.to_datetime(trips[col]).astype("datetime64[ns]")
+        for col in ["requested_pickup_time", "scheduled_pickup_time"]
+        if col in trips.columns
+    })
     
     # Setup
     drivers = [f"DRV_{i:04d}" for i in range(num_drivers)]
@@ -329,26 +704,9 @@ def run_simulation_comparison(
         for d in drivers
     }
     
-    results = []
+    results = simulate_all_strategies(trips, drivers, initial_locations, driver_capacities)
     
-    # Run each strategy
-    print("Running FCFS strategy...")
-    fcfs_assignments = assign_fcfs(trips, drivers)
-    fcfs_result = simulate_strategy(trips, fcfs_assignments, initial_locations, driver_capacities)
-    results.append(fcfs_result.to_dict())
-    
-    print("Running Nearest-Driver strategy...")
-    # nearest_assignments updates locations, so we pass a copy
-    nearest_assignments = assign_nearest(trips, drivers, initial_locations.copy())
-    nearest_result = simulate_strategy(trips, nearest_assignments, initial_locations, driver_capacities)
-    results.append(nearest_result.to_dict())
-    
-    print("Running Capacity-Aware strategy...")
-    capacity_assignments = assign_capacity_aware(trips, drivers, driver_capacities)
-    capacity_result = simulate_strategy(trips, capacity_assignments, initial_locations, driver_capacities)
-    results.append(capacity_result.to_dict())
-    
-    return pd.DataFrame(results)
+    return pd.DataFrame([result.to_dict() for result in results.values()])
 
 
 def save_simulation_results(results: pd.DataFrame) -> None:
@@ -1,11 +1,13 @@
 """Utility functions for the ModivCare Rides Efficiency project."""
 
+import math
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Tuple, Union
 
-from .config import RANDOM_SEED
+from .config import RANDOM_SEED, CATEGORICAL_COLUMNS
 
 
 def set_seed(seed: int = RANDOM_SEED) -> None:
@@ -13,29 +15,90 @@ def set_seed(seed: int = RANDOM_SEED) -> None:
     np.random.seed(seed)
 
 
+def categorize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast ID and label columns to category dtype so groupbys hash integer codes."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+ArrayOrFloat = Union[float, np.ndarray]
+
+EARTH_RADIUS_MILES = 3959
+HAVERSINE_IN_PLACE_MIN_SIZE = 10_000  # below this, temporaries are cheap
+
+
+def _haversine_scalar(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Haversine distance in miles for plain floats, using math rather than numpy."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * math.asin(math.sqrt(a))
+
+
+def haversine_vector(
+    lat1: ArrayOrFloat, lng1: ArrayOrFloat, lat2: ArrayOrFloat, lng2: ArrayOrFloat
+) -> np.ndarray:
+    """
+    Haversine distance in miles, broadcasting numpy arrays elementwise.
+    
+    Large inputs are evaluated in place in two work buffers rather than
+    allocating a temporary for every step of the expression.
+    """
+    lat1, lng1, lat2, lng2 = map(np.radians, [lat1, lng1, lat2, lng2])
+    shape = np.broadcast_shapes(np.shape(lat1), np.shape(lng1), np.shape(lat2), np.shape(lng2))
+    
+    if math.prod(shape) < HAVERSINE_IN_PLACE_MIN_SIZE:
+        dlat = lat2 - lat1
+        dlng = lng2 - lng1
+        
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(a))
+        
+        return EARTH_RADIUS_MILES * c
+    
+    # Same operations in the same order, so results are identical
+    dtype = np.result_type(lat1, lng1, lat2, lng2)
+    a = np.subtract(lat2, lat1, out=np.empty(shape, dtype=dtype))
+    a /= 2
+    np.sin(a, out=a)
+    a *= a
+    b = np.subtract(lng2, lng1, out=np.empty(shape, dtype=dtype))
+    b /= 2
+    np.sin(b, out=b)
+    b *= b
+    b *= np.cos(lat1) * np.cos(lat2)
+    a += b
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2
+    a *= EARTH_RADIUS_MILES
+    return a
+
+
 def haversine_distance(
-    lat1: float, lng1: float, lat2: float, lng2: float
-) -> float:
+    lat1: ArrayOrFloat, lng1: ArrayOrFloat, lat2: ArrayOrFloat, lng2: ArrayOrFloat
+) -> ArrayOrFloat:
     """
     Calculate the great-circle distance between two points on Earth.
     
+    Inputs broadcast against each other, so one pickup point can be
+    compared with an array of driver locations in a single call. Plain
+    scalar calls take a math-based path, avoiding numpy's per-call overhead.
+    
     Args:
-        lat1, lng1: Coordinates of first point
-        lat2, lng2: Coordinates of second point
+        lat1, lng1: Coordinates of first point (scalars or arrays)
+        lat2, lng2: Coordinates of second point (scalars or arrays)
         
     Returns:
-        Distance in miles
+        Distance in miles, elementwise for array inputs
     """
-    R = 3959  # Earth's radius in miles
-    
-    lat1, lng1, lat2, lng2 = map(np.radians, [lat1, lng1, lat2, lng2])
-    dlat = lat2 - lat1
-    dlng = lng2 - lng1
-    
-    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
-    c = 2 * np.arcsin(np.sqrt(a))
-    
-    return R * c
+    if (
+        isinstance(lat1, (float, int)) and isinstance(lng1, (float, int))
+        and isinstance(lat2, (float, int)) and isinstance(lng2, (float, int))
+    ):
+        return _haversine_scalar(lat1, lng1, lat2, lng2)
+    return haversine_vector(lat1, lng1, lat2, lng2)
 
 
 def minutes_between(start: datetime, end: datetime) -> float:
@@ -45,6 +108,24 @@ def minutes_between(start: datetime, end: datetime) -> float:
     return (end - start).total_seconds() / 60
 
 
+NS_PER_MINUTE = 60_000_000_000
+NAT_NS = np.iinfo(np.int64).min
+
+
+def minutes_between_series(start: Union[pd.Series, np.ndarray], end: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized minutes_between for whole datetime columns.
+    
+    Subtracts int64 nanosecond views, so columns parsed with different
+    datetime units line up; NaN wherever either timestamp is missing.
+    """
+    start_ns = np.asarray(start, dtype="datetime64[ns]").view(np.int64)
+    end_ns = np.asarray(end, dtype="datetime64[ns]").view(np.int64)
+    minutes = (end_ns - start_ns) / NS_PER_MINUTE
+    minutes[(start_ns == NAT_NS) | (end_ns == NAT_NS)] = np.nan
+    return minutes
+
+
 def format_duration(minutes: float) -> str:
     """Format duration in minutes to human-readable string."""
     if pd.isna(minutes):
@@ -0,0 +1,38 @@
+"""Tests for evaluation module."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.evaluation import _top_rows
+
+
+@pytest.fixture
+def tied_perf():
+    """Driver performance with several rows tied at the selection cutoff."""
+    return pd.DataFrame({
+        "driver_id": [f"DRV_{i:04d}" for i in range(8)],
+        "efficiency_index": [70.0, 55.0, 60.0, 55.0, 90.0, 55.0, 40.0, 55.0],
+    })
+
+
+class TestTopRows:
+    """Tests for bottleneck top-N row selection."""
+    
+    def test_ties_keep_first_rows(self, tied_perf):
+        """Test that rows tied at the cutoff are taken in original order."""
+        rows = _top_rows(tied_perf, "efficiency_index", 3)
+        
+        assert rows["driver_id"].tolist() == ["DRV_0006", "DRV_0001", "DRV_0003"]
+        pd.testing.assert_frame_equal(rows, tied_perf.nsmallest(3, "efficiency_index", keep="first"))
+    
+    def test_largest_ties_match_nlargest(self, tied_perf):
+        """Test that largest-first selection breaks ties as nlargest does."""
+        tied_perf["efficiency_index"] = -tied_perf["efficiency_index"]
+        rows = _top_rows(tied_perf, "efficiency_index", 4, largest=True)
+        
+        pd.testing.assert_frame_equal(rows, tied_perf.nlargest(4, "efficiency_index", keep="first"))
@@ -3,47 +3,40 @@
 import pytest
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from src import routing_simulation
 from src.routing_simulation import (
     assign_fcfs,
     assign_nearest,
     assign_capacity_aware,
+    assignments_by_trip,
     simulate_strategy,
+    simulate_all_strategies,
     SimulationResult,
+    DriverIndex,
 )
 
 
-@pytest.fixture
-def sample_trips():
-    """Create sample trip data for testing."""
-    base_time = datetime(2025, 1, 15, 8, 0)
+@pytest.fixture(scope="module")
+def _sample_trips_raw():
+    """Create sample trip data once per module."""
+    # Requests every 15 minutes, each scheduled 5 minutes later
+    requested = np.datetime64("2025-01-15T08:00") + np.arange(5) * np.timedelta64(15, "m")
     
     return pd.DataFrame({
         "trip_id": ["T001", "T002", "T003", "T004", "T005"],
-        "requested_pickup_time": [
-            base_time,
-            base_time + timedelta(minutes=15),
-            base_time + timedelta(minutes=30),
-            base_time + timedelta(minutes=45),
-            base_time + timedelta(minutes=60),
-        ],
-        "scheduled_pickup_time": [
-            base_time + timedelta(minutes=5),
-            base_time + timedelta(minutes=20),
-            base_time + timedelta(minutes=35),
-            base_time + timedelta(minutes=50),
-            base_time + timedelta(minutes=65),
-        ],
-        "pickup_lat": [33.4, 33.45, 33.5, 33.55, 33.6],
-        "pickup_lng": [-112.0, -112.05, -112.1, -112.15, -112.2],
-        "dropoff_lat": [33.42, 33.47, 33.52, 33.57, 33.62],
-        "dropoff_lng": [-112.02, -112.07, -112.12, -112.17, -112.22],
-        "distance_miles": [5, 6, 7, 8, 5],
+        "requested_pickup_time": requested,
+        "scheduled_pickup_time": requested + np.timedelta64(5, "m"),
+        # Single precision, as the cleaning stage loads them
+        "pickup_lat": np.array([33.4, 33.45, 33.5, 33.55, 33.6], dtype=np.float32),
+        "pickup_lng": np.array([-112.0, -112.05, -112.1, -112.15, -112.2], dtype=np.float32),
+        "dropoff_lat": np.array([33.42, 33.47, 33.52, 33.57, 33.62], dtype=np.float32),
+        "dropoff_lng": np.array([-112.02, -112.07, -112.12, -112.17, -112.22], dtype=np.float32),
+        "distance_miles": np.array([5, 6, 7, 8, 5], dtype=np.float32),
         "trip_duration_minutes": [20, 25, 30, 35, 20],
         "num_passengers": [1, 2, 3, 1, 2],
         "capacity_utilization": [0.25, 0.5, 0.75, 0.25, 0.5],
@@ -54,11 +47,56 @@ def sample_trips():
 
 
 @pytest.fixture
+def sample_trips(_sample_trips_raw):
+    """Sample trip data; a shallow copy, so tests cannot disturb each other."""
+    return _sample_trips_raw.copy(deep=False)
+
+
+@pytest.fixture(scope="module")
 def drivers():
     """Create sample driver list."""
     return ["DRV_0001", "DRV_0002", "DRV_0003"]
 
 
+@pytest.fixture(scope="module")
+def _overlapping_trips_raw():
+    """Trips listed out of order, scheduled out of request order, with more
+    trips than drivers so every driver is sometimes busy."""
+    rng = np.random.default_rng(42)
+    n = 60
+    requested = np.datetime64("2025-01-15T08:00") + rng.permutation(n) * np.timedelta64(7, "m")
+    duration = rng.integers(10, 60, n).astype(float)
+    duration[::9] = np.nan
+    
+    return pd.DataFrame({
+        "trip_id": [f"T{i:03d}" for i in range(n)],
+        "requested_pickup_time": requested,
+        "scheduled_pickup_time": requested + rng.integers(0, 90, n) * np.timedelta64(1, "m"),
+        "trip_duration_minutes": duration,
+    })
+
+
+def _fcfs_reference(trips, drivers):
+    """Brute-force FCFS: scan every driver for each trip in request order."""
+    trips = trips.sort_values("requested_pickup_time")
+    driver_available_at = {d: pd.Timestamp.min for d in drivers}
+    assigned = {}
+    
+    for trip in trips.itertuples():
+        available_drivers = [
+            d for d, t in driver_available_at.items() if t <= trip.scheduled_pickup_time
+        ]
+        if available_drivers:
+            driver = available_drivers[0]
+        else:
+            driver = min(driver_available_at, key=driver_available_at.get)
+        duration = 30 if pd.isna(trip.trip_duration_minutes) else trip.trip_duration_minutes
+        driver_available_at[driver] = trip.scheduled_pickup_time + pd.Timedelta(minutes=duration + 10)
+        assigned[trip.trip_id] = driver
+    
+    return assigned
+
+
 class TestFCFSAssignment:
     """Tests for FCFS assignment strategy."""
     
@@ -75,7 +113,14 @@ class TestFCFSAssignment:
     def test_uses_available_drivers(self, sample_trips, drivers):
         """Test that drivers from the pool are used."""
         assignments = assign_fcfs(sample_trips, drivers)
-        assert assignments["assigned_driver"].isin(drivers).all()
+        assert set(assignments["assigned_driver"]) <= set(drivers)
+    
+    def test_matches_brute_force_on_overlapping_trips(self, _overlapping_trips_raw, drivers):
+        """Test against a brute-force scan on unsorted trips that keep all drivers busy."""
+        trips = _overlapping_trips_raw
+        assignments = assign_fcfs(trips, drivers)
+        
+        assert assignments_by_trip(assignments) == _fcfs_reference(trips, drivers)
 
 
 class TestNearestAssignment:
@@ -101,8 +146,52 @@ class TestNearestAssignment:
         }
         assignments = assign_nearest(sample_trips, drivers, driver_locations)
         
-        first_trip_assignment = assignments[assignments["trip_id"] == "T001"]
-        assert first_trip_assignment["assigned_driver"].iloc[0] == "DRV_0001"
+        assert assignments_by_trip(assignments)["T001"] == "DRV_0001"
+    
+    def test_driver_index_matches_dict(self, sample_trips, drivers):
+        """Test that a prebuilt DriverIndex gives the same assignments."""
+        driver_locations = {
+            "DRV_0001": (33.4, -112.0),
+            "DRV_0002": (33.5, -112.1),
+            "DRV_0003": (33.6, -112.2),
+        }
+        index = DriverIndex.from_locations(drivers, driver_locations)
+        from_index = assign_nearest(sample_trips, drivers, index)
+        from_dict = assign_nearest(sample_trips, drivers, driver_locations)
+        
+        pd.testing.assert_frame_equal(from_index, from_dict)
+    
+    def test_kdtree_matches_brute_force(self, monkeypatch):
+        """Test that the KD-tree path assigns and moves drivers as brute force does."""
+        rng = np.random.default_rng(7)
+        n = 200
+        minutes = np.sort(rng.integers(0, 600, n))
+        pickup_time = np.datetime64("2025-01-15T08:00") + minutes * np.timedelta64(1, "m")
+        trips = pd.DataFrame({
+            "trip_id": [f"T{i:03d}" for i in range(n)],
+            "scheduled_pickup_time": pickup_time,
+            "pickup_lat": rng.uniform(33.2, 33.7, n),
+            "pickup_lng": rng.uniform(-112.3, -111.8, n),
+            "dropoff_lat": rng.uniform(33.2, 33.7, n),
+            "dropoff_lng": rng.uniform(-112.3, -111.8, n),
+            "trip_duration_minutes": rng.integers(10, 60, n).astype(float),
+        })
+        fleet = [f"DRV_{i:04d}" for i in range(40)]
+        driver_locations = {
+            d: (rng.uniform(33.2, 33.7), rng.uniform(-112.3, -111.8)) for d in fleet
+        }
+        
+        brute_locations = dict(driver_locations)
+        expected = assign_nearest(trips, fleet, brute_locations)
+        
+        # Rebuild often so both fresh and moved drivers are looked up
+        monkeypatch.setattr(routing_simulation, "KDTREE_MIN_DRIVERS", 1)
+        monkeypatch.setattr(routing_simulation, "KDTREE_REBUILD_EVERY", 32)
+        tree_locations = dict(driver_locations)
+        assignments = assign_nearest(trips, fleet, tree_locations)
+        
+        pd.testing.assert_frame_equal(assignments, expected)
+        assert tree_locations == brute_locations
 
 
 class TestCapacityAwareAssignment:
@@ -128,8 +217,18 @@ class TestCapacityAwareAssignment:
         assignments = assign_capacity_aware(sample_trips, drivers, driver_capacities)
         
         # Trip with 3 passengers should NOT use smallest vehicle (DRV_0001 = 2 capacity)
-        trip_3_pass = assignments[assignments["trip_id"] == "T003"]
-        assert trip_3_pass["assigned_driver"].iloc[0] != "DRV_0001"  # Can't fit 3 in capacity 2
+        assert assignments_by_trip(assignments)["T003"] != "DRV_0001"  # Can't fit 3 in capacity 2
+    
+    def test_float_passenger_counts(self, sample_trips, drivers):
+        """Test that float passenger counts and capacities assign as integers do."""
+        driver_capacities = {"DRV_0001": 2, "DRV_0002": 4, "DRV_0003": 6}
+        expected = assign_capacity_aware(sample_trips, drivers, driver_capacities)
+        
+        sample_trips["num_passengers"] = sample_trips["num_passengers"].astype(float)
+        float_capacities = {d: float(c) for d, c in driver_capacities.items()}
+        assignments = assign_capacity_aware(sample_trips, drivers, float_capacities)
+        
+        pd.testing.assert_frame_equal(assignments, expected)
 
 
 class TestSimulationResult:
@@ -166,3 +265,39 @@ class TestSimulateStrategy:
         assert isinstance(result, SimulationResult)
         assert result.total_trips > 0
         assert 0 <= result.on_time_rate <= 1
+    
+    def test_driver_with_only_cancelled_trips(self, sample_trips):
+        """Test that a driver whose only trip is cancelled is left out."""
+        sample_trips["is_cancelled"] = [False, False, False, False, True]
+        assignments = pd.DataFrame({
+            "trip_id": sample_trips["trip_id"],
+            "assigned_driver": ["DRV_0001", "DRV_0002", "DRV_0001", "DRV_0002", "DRV_0003"],
+            "strategy": "Manual",
+        })
+        result = simulate_strategy(sample_trips, assignments)
+        
+        assert result.total_trips == 4
+    
+    def test_simulate_all_strategies(self, sample_trips, drivers, monkeypatch):
+        """Test that the parallel path gives the same results as the serial one."""
+        initial_locations = {d: (33.4, -112.0) for d in drivers}
+        driver_capacities = {"DRV_0001": 2, "DRV_0002": 4, "DRV_0003": 6}
+        serial = simulate_all_strategies(sample_trips, drivers, initial_locations, driver_capacities)
+        
+        # Force the worker-process branch for this small input
+        monkeypatch.setattr(routing_simulation, "PARALLEL_MIN_TRIPS", 1)
+        monkeypatch.setattr(routing_simulation.os, "cpu_count", lambda: 4)
+        pool_started = []
+        
+        class RecordingPool(routing_simulation.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pool_started.append(True)
+                super().__init__(*args, **kwargs)
+        
+        monkeypatch.setattr(routing_simulation, "ProcessPoolExecutor", RecordingPool)
+        parallel = simulate_all_strategies(sample_trips, drivers, initial_locations, driver_capacities)
+        
+        assert pool_started
+        assert list(serial) == ["FCFS", "Nearest", "Capacity-Aware"]
+        assert parallel == serial
+        assert all(result.total_trips == len(sample_trips) for result in serial.values())
@@ -0,0 +1,32 @@
+"""Tests for shared utility functions."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils import minutes_between_series
+
+
+class TestMinutesBetweenSeries:
+    """Tests for vectorized minutes_between."""
+    
+    def test_minutes_between_columns(self):
+        """Test minute differences, including negative ones."""
+        start = pd.Series(pd.to_datetime(["2025-01-15 08:00", "2025-01-15 09:30"]))
+        end = pd.Series(pd.to_datetime(["2025-01-15 08:45", "2025-01-15 09:00"]))
+        
+        np.testing.assert_array_equal(minutes_between_series(start, end), [45.0, -30.0])
+    
+    def test_missing_timestamps_give_nan(self):
+        """Test that NaT on either side yields NaN."""
+        start = pd.Series(pd.to_datetime(["2025-01-15 08:00", None, "2025-01-15 10:00"]))
+        end = pd.Series(pd.to_datetime(["2025-01-15 08:15", "2025-01-15 09:00", None]))
+        
+        minutes = minutes_between_series(start, end)
+        
+        assert minutes[0] == 15.0
+        assert np.isnan(minutes[1:]).all()